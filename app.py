@@ -1,105 +1,1211 @@
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, Response, g, has_request_context, render_template_string, request, jsonify, send_file, stream_with_context
 import numpy as np
+import os
+import json
+import math
+import time
+import uuid
+import functools
+import tempfile
+import hashlib
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get('CDS_LOG_LEVEL', 'INFO'))
 
 app = Flask(__name__)
 
+# Subproblems are split across a thread pool only when there is enough work:
+# the NumPy kernels release the GIL, and every worker reads the same
+# processing-times array instead of a per-task copy.
+CDS_WORKERS = int(os.environ.get('CDS_WORKERS', 1))
+CDS_PARALLEL_MIN_CELLS = int(os.environ.get('CDS_PARALLEL_MIN_CELLS', 2000000))
+
+# CDS keeps the full completion matrices of a block of candidate orders, so
+# the winner's schedule is not recomputed, while they fit in this many cells.
+CDS_COMPLETION_CELLS = int(os.environ.get('CDS_COMPLETION_CELLS', 250000))
+
+# Candidate orders are evaluated in chunks of at most this many cells
+# (orders x jobs), which bounds the rolling rows of the makespan kernels.
+CDS_EVAL_CELLS = int(os.environ.get('CDS_EVAL_CELLS', 2000000))
+
+# Upper bound on the improvement time a request may ask for.
+CDS_MAX_TIME_BUDGET_MS = float(os.environ.get('CDS_MAX_TIME_BUDGET_MS', 10000))
+
+# Default limits of the exact branch-and-bound mode; requests may override
+# them, with the time limit capped like the improvement budget. Larger
+# instances than CDS_EXACT_MAX_JOBS jobs are refused.
+CDS_EXACT_NODE_LIMIT = int(os.environ.get('CDS_EXACT_NODE_LIMIT', 200000))
+CDS_EXACT_TIME_LIMIT_MS = float(os.environ.get('CDS_EXACT_TIME_LIMIT_MS', 2000))
+CDS_EXACT_MAX_JOBS = int(os.environ.get('CDS_EXACT_MAX_JOBS', 15))
+
+# Default deadline of the portfolio mode, capped like the improvement budget.
+CDS_PORTFOLIO_DEADLINE_MS = float(os.environ.get('CDS_PORTFOLIO_DEADLINE_MS', 1000))
+
+# Upper bound on the number of instances /batch solves at the same time.
+CDS_BATCH_MAX_WORKERS = int(os.environ.get('CDS_BATCH_MAX_WORKERS', os.cpu_count() or 1))
+
+# Binary and CSV instances are read straight into this dtype; server-side
+# .npy files under CDS_INSTANCE_DIR are memory-mapped.
+INSTANCE_DTYPE = np.int64
+CDS_INSTANCE_DIR = os.environ.get('CDS_INSTANCE_DIR', 'instances')
+
+CDS_CACHE_SIZE = int(os.environ.get('CDS_CACHE_SIZE', 128))
+CDS_CACHE_MAX_BYTES = int(os.environ.get('CDS_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+CDS_CACHE_TTL = float(os.environ.get('CDS_CACHE_TTL', 600))
+
+# Solved instances kept for /download-pdf/<result_id>.
+CDS_RESULT_STORE_SIZE = int(os.environ.get('CDS_RESULT_STORE_SIZE', 64))
+CDS_RESULT_STORE_MAX_BYTES = int(os.environ.get('CDS_RESULT_STORE_MAX_BYTES', 256 * 1024 * 1024))
+CDS_RESULT_STORE_TTL = float(os.environ.get('CDS_RESULT_STORE_TTL', 3600))
+
+# Background jobs (/jobs): worker threads, how many jobs may be queued or
+# running at once, how many finished jobs are kept for polling, and the
+# improvement time a job may ask for.
+CDS_JOB_WORKERS = int(os.environ.get('CDS_JOB_WORKERS', 2))
+CDS_JOB_QUEUE = int(os.environ.get('CDS_JOB_QUEUE', 32))
+CDS_JOB_RETENTION = int(os.environ.get('CDS_JOB_RETENTION', 256))
+CDS_JOB_MAX_TIME_BUDGET_MS = float(os.environ.get('CDS_JOB_MAX_TIME_BUDGET_MS', 300000))
+
+# The 'lod' Gantt format sends every operation up to this many bars, and
+# per-machine time buckets beyond it.
+CDS_GANTT_MAX_BARS = int(os.environ.get('CDS_GANTT_MAX_BARS', 5000))
+
+# Incremental sessions (/sessions) kept in memory for small edits.
+CDS_SESSION_LIMIT = int(os.environ.get('CDS_SESSION_LIMIT', 64))
+CDS_SESSION_MAX_BYTES = int(os.environ.get('CDS_SESSION_MAX_BYTES', 512 * 1024 * 1024))
+CDS_SESSION_TTL = float(os.environ.get('CDS_SESSION_TTL', 3600))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+INSTANCE_CELL_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+class Metrics:
+    # Request latency histograms, phase totals and instance sizes, rendered
+    # in the Prometheus text exposition format.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self._latency_sum = defaultdict(float)
+        self._requests = defaultdict(int)
+        self._phase_sum = defaultdict(float)
+        self._phase_count = defaultdict(int)
+        self._instance_cells = [0] * (len(INSTANCE_CELL_BUCKETS) + 1)
+        self._instance_totals = defaultdict(int)
+    
+    def observe_request(self, endpoint, status, seconds, phases):
+        with self._lock:
+            self._latency[endpoint][_bucket_index(LATENCY_BUCKETS, seconds)] += 1
+            self._latency_sum[endpoint] += seconds
+            self._requests[endpoint, status] += 1
+            for name, duration in phases.items():
+                self._phase_sum[name] += duration
+                self._phase_count[name] += 1
+    
+    def observe_instance(self, n_machines, n_jobs):
+        with self._lock:
+            self._instance_cells[_bucket_index(INSTANCE_CELL_BUCKETS, n_machines * n_jobs)] += 1
+            self._instance_totals['instances'] += 1
+            self._instance_totals['machines'] += n_machines
+            self._instance_totals['jobs'] += n_jobs
+    
+    def render(self):
+        with self._lock:
+            lines = [
+                '# HELP cds_requests_total Requests handled, by endpoint and status.',
+                '# TYPE cds_requests_total counter'
+            ]
+            for (endpoint, status), count in sorted(self._requests.items()):
+                lines.append(f'cds_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            
+            lines += [
+                '# HELP cds_request_duration_seconds Request latency, by endpoint.',
+                '# TYPE cds_request_duration_seconds histogram'
+            ]
+            for endpoint, counts in sorted(self._latency.items()):
+                labels = f'endpoint="{endpoint}"'
+                lines += _histogram_lines('cds_request_duration_seconds', labels, LATENCY_BUCKETS, counts, self._latency_sum[endpoint])
+            
+            lines += [
+                '# HELP cds_phase_seconds_total Time spent in each solver phase.',
+                '# TYPE cds_phase_seconds_total counter'
+            ]
+            for name, total in sorted(self._phase_sum.items()):
+                lines.append(f'cds_phase_seconds_total{{phase="{name}"}} {total}')
+            lines += [
+                '# HELP cds_phase_runs_total Number of times each solver phase ran.',
+                '# TYPE cds_phase_runs_total counter'
+            ]
+            for name, count in sorted(self._phase_count.items()):
+                lines.append(f'cds_phase_runs_total{{phase="{name}"}} {count}')
+            
+            lines += [
+                '# HELP cds_instance_cells Size (machines x jobs) of solved instances.',
+                '# TYPE cds_instance_cells histogram'
+            ]
+            lines += _histogram_lines('cds_instance_cells', '', INSTANCE_CELL_BUCKETS, self._instance_cells, None)
+            for name in ('instances', 'machines', 'jobs'):
+                lines += [
+                    f'# HELP cds_{name}_total Total {name} across solved instances.',
+                    f'# TYPE cds_{name}_total counter',
+                    f'cds_{name}_total {self._instance_totals[name]}'
+                ]
+        return '\n'.join(lines) + '\n'
+
+def _bucket_index(buckets, value):
+    for i, bound in enumerate(buckets):
+        if value <= bound:
+            return i
+    return len(buckets)
+
+def _histogram_lines(name, labels, buckets, counts, total):
+    prefix = f'{labels},' if labels else ''
+    lines = []
+    cumulative = 0
+    for bound, count in zip(buckets + ('+Inf',), counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    labels = f'{{{labels}}}' if labels else ''
+    if total is not None:
+        lines.append(f'{name}_sum{labels} {total}')
+    lines.append(f'{name}_count{labels} {cumulative}')
+    return lines
+
+metrics = Metrics()
+
+@contextmanager
+def phase(name):
+    # Times a block into the current request's Server-Timing entries. Outside
+    # a request (worker threads, scripts) it does nothing.
+    if not has_request_context():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = g.setdefault('phase_timings', {})
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def add_server_timing(response):
+    started = g.get('request_started', time.perf_counter())
+    elapsed = time.perf_counter() - started
+    timings = g.setdefault('phase_timings', {})
+    entries = [f'{name};dur={duration * 1000:.3f}' for name, duration in timings.items()]
+    entries.append(f'total;dur={elapsed * 1000:.3f}')
+    response.headers['Server-Timing'] = ', '.join(entries)
+    if request.endpoint != 'metrics_endpoint':
+        endpoint, status = request.endpoint or 'unknown', response.status_code
+        if response.is_streamed:
+            # A streamed body (/batch) is produced after this hook: its
+            # latency and the phases timed while streaming are recorded
+            # when the stream closes.
+            response.call_on_close(lambda: metrics.observe_request(endpoint, status, time.perf_counter() - started, timings))
+        else:
+            metrics.observe_request(endpoint, status, elapsed, timings)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def load_instance(source, fmt='npy', mmap=False):
+    if fmt == 'npy':
+        matrix = np.load(source, mmap_mode='r' if mmap else None, allow_pickle=False)
+    elif fmt == 'csv':
+        matrix = np.loadtxt(source, delimiter=',', dtype=INSTANCE_DTYPE, ndmin=2)
+    else:
+        raise ValueError(f"Unknown instance format: {fmt}")
+    
+    if matrix.ndim != 2 or matrix.size == 0 or matrix.dtype.kind not in 'iub':
+        raise ValueError("An instance must be a non-empty 2-D integer matrix (machines x jobs)")
+    return matrix.astype(INSTANCE_DTYPE, copy=False)
+
+def matrix_from_json(matrix):
+    # JSON matrices may hold floats, unlike instance files.
+    matrix = np.array(matrix)
+    if matrix.ndim != 2 or matrix.size == 0 or matrix.dtype.kind not in 'iuf' or not np.isfinite(matrix).all():
+        raise ValueError("A matrix must be a non-empty 2-D matrix of finite numbers (machines x jobs)")
+    return matrix
+
+def _typed_options(values):
+    # Solver options sent as query-string or form fields arrive as strings.
+    options = values.to_dict()
+    for key, value_type in (('time_budget_ms', float), ('time_limit_ms', float), ('deadline_ms', float), ('seed', int), ('workers', int), ('node_limit', int),
+                              ('gantt_max_bars', int), ('gantt_width', int)):
+        if key in options:
+            # A value that does not convert stays a string, so solve_options
+            # rejects it instead of silently using the default.
+            converted = values.get(key, type=value_type)
+            options[key] = options[key] if converted is None else converted
+    if 'gantt' in options:
+        options['gantt'] = options['gantt'] in ('1', 'true')
+    return options
+
+def read_instance():
+    # Returns the processing-times matrix of a solve request and the
+    # options sent along with it.
+    if request.mimetype in ('application/x-npy', 'application/octet-stream'):
+        body = request.get_data()
+        if body.startswith(b'\x93NUMPY'):
+            return load_instance(BytesIO(body)), _typed_options(request.args)
+        n_machines = request.args.get('machines', type=int)
+        n_jobs = request.args.get('jobs', type=int)
+        if (n_machines or 0) < 1 or (n_jobs or 0) < 1:
+            raise ValueError("Raw binary instances need 'machines' and 'jobs' query parameters")
+        return np.frombuffer(body, dtype=INSTANCE_DTYPE).reshape(n_machines, n_jobs), _typed_options(request.args)
+    
+    if request.mimetype == 'text/csv':
+        return load_instance(BytesIO(request.get_data()), 'csv'), _typed_options(request.args)
+    
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('matrix')
+        if upload is None:
+            raise ValueError("No 'matrix' file uploaded")
+        fmt = 'csv' if upload.filename.lower().endswith('.csv') else 'npy'
+        return load_instance(upload.stream, fmt), _typed_options(request.form)
+    
+    data = request.get_json(silent=True) or {}
+    if 'instance' in data:
+        name = data['instance']
+        if os.path.basename(name) != name or not name.endswith(('.npy', '.csv')):
+            raise ValueError(f"Invalid instance name: {name}")
+        path = os.path.join(CDS_INSTANCE_DIR, name)
+        if not os.path.isfile(path):
+            raise ValueError(f"Unknown instance: {name}")
+        fmt = 'csv' if name.endswith('.csv') else 'npy'
+        return load_instance(path, fmt, mmap=(fmt == 'npy')), data
+    
+    if 'matrix' not in data:
+        raise ValueError("No matrix received")
+    return matrix_from_json(data['matrix']), data
+
 def johnson_rule(two_machines_jobs):
-    n_jobs = len(two_machines_jobs)
-    job_order = []
-    jobs = list(range(n_jobs))
-    
-    while jobs:
-        min_time = float('inf')
-        selected_job = None
-        selected_machine = None
-        
-        for job in jobs:
-            machine_1_time, machine_2_time = two_machines_jobs[job]
-            if machine_1_time < min_time or machine_2_time < min_time:
-                min_time = min(machine_1_time, machine_2_time)
-                selected_job = job
-                selected_machine = 0 if machine_1_time < machine_2_time else 1
-        
-        if selected_machine == 0:
-            job_order.insert(0, selected_job)
+    two_machines_jobs = np.asarray(two_machines_jobs)
+    if two_machines_jobs.size == 0:
+        return []
+    return johnson_rule_batch(two_machines_jobs[np.newaxis])[0].tolist()
+
+def johnson_rule_batch(subproblems):
+    subproblems = np.asarray(subproblems)
+    if subproblems.size == 0:
+        return np.empty(subproblems.shape[:2], dtype=np.intp)
+    if subproblems.dtype.kind in 'ub':
+        subproblems = subproblems.astype(np.int64)
+    
+    machine_1_time = subproblems[..., 0]
+    machine_2_time = subproblems[..., 1]
+    index = np.broadcast_to(np.arange(subproblems.shape[1]), machine_1_time.shape)
+    
+    # Jobs faster on the first machine go to the front, by decreasing
+    # machine 1 time; the others go to the back, by increasing machine 2
+    # time. Ties keep the scan order of the original selection loop.
+    front = machine_1_time < machine_2_time
+    group = np.where(front, 0, 1)
+    key = np.where(front, -machine_1_time, machine_2_time)
+    tie = np.where(front, -index, index)
+    
+    return np.lexsort((tie, key, group), axis=-1)
+
+def _exact_dtype(processing_times):
+    return processing_times.dtype.kind in 'iub'
+
+def _working_dtype(processing_times):
+    # Integer times stay integers: int32 when the sum of all times, which
+    # bounds every completion time, fits, int64 otherwise.
+    if not _exact_dtype(processing_times):
+        return np.float64
+    if processing_times.size == 0 or (processing_times.min() >= 0 and processing_times.sum(dtype=np.int64) <= np.iinfo(np.int32).max):
+        return np.int32
+    return np.int64
+
+def _working_times(processing_times):
+    return processing_times.astype(_working_dtype(processing_times), copy=False)
+
+def _to_python(value):
+    # NumPy scalars are not JSON serializable; integers stay integers.
+    return value.item() if isinstance(value, np.generic) else value
+
+def _machine_rows(job_orders, processing_times):
+    # Completion times along the machine axis. On machine i,
+    # C[i][j] = max(C[i-1][j], C[i][j-1]) + p[i][j] unrolls to
+    # S[j] + max over l <= j of (C[i-1][l] - S[l-1]) where S is the prefix sum
+    # of machine i, so each row is one cumsum and one running maximum.
+    # Only used for integer times, where the rewrite is exact; times are
+    # expected in their working dtype, which the rows keep.
+    previous = None
+    for i in range(processing_times.shape[0]):
+        times = processing_times[i][job_orders]
+        prefix = np.cumsum(times, axis=-1, dtype=times.dtype)
+        if previous is None:
+            previous = prefix
         else:
-            job_order.append(selected_job)
-        
-        jobs.remove(selected_job)
+            previous = prefix + np.maximum.accumulate(previous - (prefix - times), axis=-1)
+        yield previous
+
+def _anti_diagonals(job_orders, processing_times):
+    # Completion times by anti-diagonal: every cell with i + j == d only
+    # depends on diagonal d - 1, so a diagonal is one vectorized step made of
+    # the same max/add operations as the scalar recurrence.
+    n_machines = processing_times.shape[0]
+    n_jobs = job_orders.shape[-1]
+    current = np.full(job_orders.shape[:-1] + (n_machines + 1,), -np.inf)
+    current[..., 1] = processing_times[0][job_orders[..., 0]]
+    yield 0, current[..., 1:2]
     
-    return job_order
+    for d in range(1, n_machines + n_jobs - 1):
+        lo = max(0, d - n_jobs + 1)
+        hi = min(n_machines - 1, d)
+        machines = np.arange(lo, hi + 1)
+        times = processing_times[machines, job_orders[..., d - machines]]
+        current[..., lo + 1:hi + 2] = np.maximum(current[..., lo:hi + 1], current[..., lo + 1:hi + 2]) + times
+        yield d, current[..., lo + 1:hi + 2]
 
 def calculate_makespan(jobs, processing_times):
-    n_jobs = len(jobs)
+    return calculate_completions(np.asarray(jobs, dtype=np.intp)[np.newaxis], processing_times)[0]
+
+def calculate_completions(job_orders, processing_times):
+    # Full completion matrices of a batch of orders, (orders, machines, jobs).
+    processing_times = np.asarray(processing_times)
+    job_orders = np.atleast_2d(np.asarray(job_orders, dtype=np.intp))
+    n_jobs = job_orders.shape[1]
     n_machines = len(processing_times)
     
-    completion_time = np.zeros((n_machines, n_jobs))
+    times = _working_times(processing_times)
+    completion_times = np.zeros((len(job_orders), n_machines, n_jobs), dtype=times.dtype)
     
-    completion_time[0][0] = processing_times[0][jobs[0]]
+    if _exact_dtype(processing_times):
+        for i, row in enumerate(_machine_rows(job_orders, times)):
+            completion_times[:, i] = row
+    else:
+        for d, diagonal in _anti_diagonals(job_orders, processing_times):
+            machines = np.arange(max(0, d - n_jobs + 1), min(n_machines - 1, d) + 1)
+            completion_times[:, machines, d - machines] = diagonal
     
-    for j in range(1, n_jobs):
-        completion_time[0][j] = completion_time[0][j-1] + processing_times[0][jobs[j]]
+    return completion_times
+
+def calculate_makespans(job_orders, processing_times):
+    # Makespans only: the kernels keep one rolling row (or diagonal) per
+    # order and no completion matrix, and large batches go in chunks of
+    # CDS_EVAL_CELLS cells so those rows stay bounded too.
+    processing_times = np.asarray(processing_times)
+    job_orders = np.atleast_2d(np.asarray(job_orders, dtype=np.intp))
+    chunk = max(1, CDS_EVAL_CELLS // max(1, job_orders.shape[1]))
+    if len(job_orders) > chunk:
+        times = _working_times(processing_times) if _exact_dtype(processing_times) else processing_times
+        return np.concatenate([calculate_makespans(job_orders[start:start + chunk], times) for start in range(0, len(job_orders), chunk)])
     
-    for i in range(1, n_machines):
-        for j in range(n_jobs):
-            if j == 0:
-                completion_time[i][j] = completion_time[i-1][j] + processing_times[i][jobs[j]]
-            else:
-                completion_time[i][j] = max(completion_time[i-1][j], completion_time[i][j-1]) + processing_times[i][jobs[j]]
+    if _exact_dtype(processing_times):
+        for row in _machine_rows(job_orders, _working_times(processing_times)):
+            pass
+        return row[:, -1]
     
-    return completion_time
+    for d, diagonal in _anti_diagonals(job_orders, processing_times):
+        pass
+    return diagonal[:, -1]
+
+def _last_machines_times(times, out):
+    # Time on machines k .. m-1 for k = 1 .. m-1, along the first axis.
+    # Integers take one prefix sum from the last machine. Floats are added
+    # in forward machine order, like a per-job sum(), since a different
+    # rounding can flip Johnson ties.
+    if out.dtype.kind == 'f':
+        for k in range(1, len(times)):
+            out[k - 1] = np.cumsum(times[k:], axis=0, dtype=out.dtype)[-1]
+    else:
+        np.cumsum(times[:0:-1], axis=0, out=out[::-1])
+    return out
 
 def generate_subproblems(processing_times):
-    n_jobs, n_machines = processing_times.shape
-    subproblems = []
-    
-    for k in range(1, n_machines):
-        subproblem = []
-        for job in range(n_jobs):
-            machine_1_time = sum(processing_times[job][:k])
-            machine_2_time = sum(processing_times[job][k:])
-            subproblem.append((machine_1_time, machine_2_time))
-        
-        subproblems.append(subproblem)
+    # processing_times is machines x jobs, as sent by the form.
+    processing_times = np.asarray(processing_times)
+    n_machines, n_jobs = processing_times.shape
+    
+    # Subproblem k (k = 1 .. m-1) pairs the first k machines with the last
+    # m-k ones: a prefix sum along the machine axis gives the first.
+    subproblems = np.empty((n_machines - 1, n_jobs, 2), dtype=_working_dtype(processing_times))
+    np.cumsum(processing_times[:-1], axis=0, out=subproblems[:, :, 0])
+    _last_machines_times(processing_times, subproblems[:, :, 1])
     
     return subproblems
 
-def cds_algorithm(processing_times):
-    n_jobs, n_machines = processing_times.shape
-    subproblems = generate_subproblems(processing_times)
+def lower_bound(processing_times):
+    # Taillard's bound: the larger of the machine-based bound (least head +
+    # machine load + least tail, over machines) and the longest job.
+    processing_times = np.asarray(processing_times)
+    times = _working_times(processing_times)
+    heads = np.cumsum(times, axis=0) - times
+    tails = np.cumsum(times[::-1], axis=0)[::-1] - times
+    machine_bound = heads.min(axis=1) + times.sum(axis=1) + tails.min(axis=1)
+    job_bound = times.sum(axis=0)
+    return max(machine_bound.max(), job_bound.max()).item()
+
+def cds_workers(processing_times, workers=None):
+    n_machines, n_jobs = np.shape(processing_times)
+    workers = CDS_WORKERS if workers is None else workers
+    workers = max(1, min(int(workers), n_machines - 1, os.cpu_count() or 1))
+    if (n_machines - 1) * n_machines * n_jobs < CDS_PARALLEL_MIN_CELLS:
+        return 1
+    return workers
+
+def _pool_map(pool, workers, function, indices):
+    # Applies function to up to workers slices of indices on the pool, or to
+    # all of them at once without a pool; returns (slice, result) pairs.
+    if pool is None or len(indices) < 2:
+        return [(indices, function(indices))]
+    parts = [part for part in np.array_split(indices, workers) if len(part)]
+    return list(zip(parts, pool.map(function, parts)))
+
+def _evaluate_orders(job_orders, processing_times, memo=None, pool=None, workers=1):
+    # Different k often give the same Johnson order: each distinct order is
+    # evaluated once, and memo (order bytes -> makespan) carries the ones
+    # already seen in earlier blocks. Returns the orders, their makespans,
+    # the completion matrix of the block's best new order when it was kept,
+    # the number of orders evaluated, pruned (none here) and the cells
+    # skipped (none here).
+    memo = {} if memo is None else memo
+    with phase('dedup'):
+        keys = [order.tobytes() for order in job_orders]
+        fresh = {}
+        for i, key in enumerate(keys):
+            if key not in memo:
+                fresh.setdefault(key, i)
+        fresh_orders = job_orders[list(fresh.values())]
+    
+    completion_time = None
+    with phase('makespan'):
+        if len(fresh_orders) and fresh_orders.size * processing_times.shape[0] <= CDS_COMPLETION_CELLS:
+            completion_times = calculate_completions(fresh_orders, processing_times)
+            spans = completion_times[:, -1, -1]
+            completion_time = completion_times[int(np.argmin(spans))].copy()
+        else:
+            parts = _pool_map(pool, workers, lambda part: calculate_makespans(fresh_orders[part], processing_times),
+                              np.arange(len(fresh_orders)))
+            spans = np.concatenate([part_spans for _, part_spans in parts]) if len(fresh_orders) else []
+    
+    memo.update(zip(fresh, spans))
+    makespans = np.array([memo[key] for key in keys])
+    return job_orders, makespans, completion_time, len(fresh_orders), 0, 0
+
+def _pruned_makespans(job_orders, ranks, times, tails, bounds, incumbent, incumbent_rank):
+    # Machine-row recurrence that drops an order as soon as it cannot beat
+    # the incumbent (makespan, rank): after machine i, the order needs at
+    # least its last job's completion there plus that job's remaining
+    # operations (tails), and never less than its static bound. An equal
+    # bound only prunes orders ranked after the incumbent, so the first best
+    # order still wins. Returns the makespans (-1 when pruned), the pruned
+    # mask and the machine rows computed per order.
+    n_machines = len(times)
+    makespans = np.full(len(job_orders), -1, dtype=times.dtype)
+    rows = np.full(len(job_orders), n_machines)
+    
+    def hopeless(bounds, ranks):
+        return (bounds > incumbent) | ((bounds == incumbent) & (ranks > incumbent_rank))
+    
+    pruned = hopeless(bounds, ranks)
+    rows[pruned] = 0
+    active = np.flatnonzero(~pruned)
+    orders = job_orders[active]
+    row = None
+    for i in range(n_machines):
+        if not active.size:
+            break
+        machine_times = times[i][orders]
+        prefix = np.cumsum(machine_times, axis=-1, dtype=times.dtype)
+        row = prefix if row is None else prefix + np.maximum.accumulate(row - (prefix - machine_times), axis=-1)
+        if i < n_machines - 1:
+            cut = hopeless(row[:, -1] + tails[i][orders[:, -1]], ranks[active])
+            if cut.any():
+                rows[active[cut]] = i + 1
+                active, orders, row = active[~cut], orders[~cut], row[~cut]
+    if active.size:
+        makespans[active] = row[:, -1]
+    return makespans, rows < n_machines, rows
+
+def _evaluate_orders_pruned(job_orders, processing_times, lower_bound=None, should_stop=None, pool=None, workers=1):
+    # CDS evaluation against the incumbent: the middle k is evaluated first
+    # for an incumbent, then the other distinct orders, middle-out in
+    # batches of CDS_EVAL_CELLS cells, are pruned against the best
+    # (makespan, k) found so far. A batch split across the pool's workers
+    # shares the incumbent of its start, so the result does not depend on
+    # workers. Only exact for non-negative integer times, like the
+    # machine-row kernel it builds on.
+    times = _working_times(processing_times)
+    n_machines, n_jobs = times.shape
+    with phase('dedup'):
+        first = {}
+        keys = [order.tobytes() for order in job_orders]
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+        ranks = np.fromiter(first.values(), dtype=np.intp, count=len(first))
+        unique = {key: u for u, key in enumerate(first)}
+    
+    with phase('makespan'):
+        orders = job_orders[ranks]
+        prefix = np.cumsum(times, axis=0)
+        heads = prefix - times
+        tails = prefix[-1] - prefix
+        # Static bound per order: on every machine, the first job's head,
+        # the machine load and the last job's tail.
+        bounds = (heads[:, orders[:, 0]] + times.sum(axis=1)[:, np.newaxis] + tails[:, orders[:, -1]]).max(axis=0)
+        if lower_bound is not None:
+            bounds = np.maximum(bounds, lower_bound)
+        
+        middle = (len(ranks) - 1) // 2
+        schedule = np.array(sorted(range(len(ranks)), key=lambda u: (abs(u - middle), u)), dtype=np.intp)
+        makespans = np.empty(len(ranks), dtype=times.dtype)
+        pruned = np.empty(len(ranks), dtype=bool)
+        rows = np.empty(len(ranks), dtype=np.intp)
+        incumbent, incumbent_rank = np.inf, -1
+        chunk = max(1, CDS_EVAL_CELLS // max(1, n_jobs))
+        start, size = 0, 1
+        while start < len(schedule):
+            if should_stop is not None and should_stop():
+                raise SolveCancelled()
+            batch = schedule[start:start + size]
+            evaluate = lambda part: _pruned_makespans(
+                orders[part], ranks[part], times, tails, bounds[part], incumbent, incumbent_rank)
+            for part, (part_spans, part_pruned, part_rows) in _pool_map(pool, workers, evaluate, batch):
+                makespans[part], pruned[part], rows[part] = part_spans, part_pruned, part_rows
+            for u in batch[~pruned[batch]]:
+                if (makespans[u], ranks[u]) < (incumbent, incumbent_rank):
+                    incumbent, incumbent_rank = makespans[u], ranks[u]
+            start, size = start + len(batch), chunk
+    
+    spans = [None if skip else span for span, skip in zip(makespans.tolist(), pruned)]
+    result = np.array([spans[unique[key]] for key in keys], dtype=object)
+    skipped_cells = int((n_machines - rows[pruned]).sum()) * n_jobs
+    return job_orders, result, None, int((~pruned).sum()), int(pruned.sum()), skipped_cells
+
+def cds_algorithm(processing_times, workers=None, lower_bound=None, job_orders=None, should_stop=None):
+    # job_orders are the Johnson orders of every k when the caller already
+    # has them (an incremental session); they are evaluated serially.
+    # should_stop is polled between evaluation batches and raises
+    # SolveCancelled, as no schedule exists before CDS finishes.
+    processing_times = np.asarray(processing_times)
+    if job_orders is None:
+        with phase('subproblems'):
+            subproblems = generate_subproblems(processing_times)
+        workers = cds_workers(processing_times, workers)
+    else:
+        workers = 1
     
     best_order = None
     best_makespan = float('inf')
+    best_block = None
     all_orders = []
     
-    for i, subproblem in enumerate(subproblems):
-        job_order = johnson_rule(subproblem)
-        completion_time = calculate_makespan(job_order, processing_times)
-        makespan = completion_time[-1][-1]
+    if processing_times.shape[0] == 1:
+        # A single machine has no subproblem; every order is optimal.
+        job_orders = np.arange(processing_times.shape[1])[np.newaxis]
+        blocks = [(job_orders, calculate_makespans(job_orders, processing_times), None, 1, 0, 0)]
+    else:
+        # With several workers the Johnson orders are built and evaluated in
+        # slices on a pool, but deduplicated and pruned as one sequence, so
+        # the orders, makespans and stats match a serial run.
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            if job_orders is None:
+                with phase('johnson'):
+                    if pool is None:
+                        job_orders = johnson_rule_batch(subproblems)
+                    else:
+                        job_orders = np.concatenate(list(pool.map(johnson_rule_batch, np.array_split(subproblems, workers))))
+            if _exact_dtype(processing_times) and processing_times.min() >= 0:
+                blocks = [_evaluate_orders_pruned(job_orders, processing_times, lower_bound, should_stop, pool, workers)]
+            elif lower_bound is not None:
+                # Evaluate orders in doubling blocks and stop as soon as one
+                # reaches the lower bound, which no later order can beat.
+                memo = {}
+                blocks = []
+                start, size = 0, 1
+                while start < len(job_orders):
+                    if should_stop is not None and should_stop():
+                        raise SolveCancelled()
+                    blocks.append(_evaluate_orders(job_orders[start:start + size], processing_times, memo, pool, workers))
+                    if blocks[-1][1].min() <= lower_bound:
+                        break
+                    start, size = start + size, size * 2
+            else:
+                blocks = [_evaluate_orders(job_orders, processing_times, None, pool, workers)]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    for block, (job_orders, makespans, _, _, _, _) in enumerate(blocks):
+        for job_order, makespan in zip(job_orders.tolist(), makespans.tolist()):
+            all_orders.append({
+                'iteration': len(all_orders) + 1,
+                'order': [j + 1 for j in job_order],
+                'makespan': makespan
+            })
+            
+            if makespan is None:
+                all_orders[-1]['pruned'] = True
+            elif makespan < best_makespan:
+                best_makespan = makespan
+                best_order = job_order
+                best_block = block
+    
+    # The first best order is the first occurrence of that order, so its
+    # block kept its completion matrix unless it was over the cell budget.
+    completion_time = blocks[best_block][2]
+    if completion_time is None:
+        with phase('completion'):
+            completion_time = calculate_makespan(best_order, processing_times)
+    
+    # Every candidate is a distinct order evaluated, a distinct order
+    # pruned, or a duplicate of an earlier one.
+    evaluated = sum(block[3] for block in blocks)
+    pruned = sum(block[4] for block in blocks)
+    stats = {
+        'candidates': len(all_orders),
+        'evaluated': evaluated,
+        'duplicates': len(all_orders) - evaluated - pruned,
+        'pruned': pruned,
+        'skipped_cells': sum(block[5] for block in blocks)
+    }
+    return best_order, best_makespan, all_orders, completion_time, stats
+
+def palmer_order(processing_times):
+    # Palmer's slope index: jobs whose times grow along the machines go
+    # first. Ties keep the job index order.
+    times = _working_times(np.asarray(processing_times))
+    n_machines = len(times)
+    slopes = (2 * np.arange(n_machines) - n_machines + 1) @ times
+    return np.argsort(-slopes, kind='stable').tolist()
+
+def gupta_order(processing_times):
+    # Gupta's index: jobs shorter on the first machine than on the last go
+    # first, then by the smallest time over two consecutive machines.
+    times = _working_times(np.asarray(processing_times))
+    pairs = times[:-1] + times[1:] if len(times) > 1 else times
+    sign = np.where(times[0] < times[-1], -1.0, 1.0)
+    return np.argsort(sign / np.maximum(pairs.min(axis=0), 1e-12), kind='stable').tolist()
+
+HEURISTICS = {'palmer': palmer_order, 'gupta': gupta_order}
+
+def _completion_times(times):
+    # Completion matrix of jobs already laid out column by column in times.
+    completion = np.cumsum(times, axis=1)
+    for i in range(1, len(times)):
+        completion[i] += np.maximum.accumulate(completion[i - 1] - (completion[i] - times[i]))
+    return completion
+
+def _insertion_makespans(heads, tails, job_times):
+    # Taillard's acceleration: the makespan of inserting a job at every
+    # position of a sequence, from the sequence's heads (completion times)
+    # and tails (time from each operation start to the end), in O(nm).
+    n_machines, length = heads.shape
+    before = np.zeros((n_machines, length + 1), dtype=heads.dtype)
+    before[:, 1:] = heads
+    after = np.zeros((n_machines, length + 1), dtype=tails.dtype)
+    after[:, :length] = tails
+    
+    prefix = np.cumsum(job_times)
+    inserted = prefix[:, np.newaxis] + np.maximum.accumulate(before - (prefix - job_times)[:, np.newaxis], axis=0)
+    return (inserted + after).max(axis=0)
+
+def _best_insertion(sequence, job, times):
+    sequence_times = times[:, sequence]
+    heads = _completion_times(sequence_times)
+    tails = _completion_times(sequence_times[::-1, ::-1])[::-1, ::-1]
+    makespans = _insertion_makespans(heads, tails, times[:, job])
+    position = int(np.argmin(makespans))
+    return position, makespans[position]
+
+class SolveCancelled(Exception):
+    pass
+
+def neh_algorithm(processing_times, initial_order=None, should_stop=None):
+    processing_times = np.asarray(processing_times)
+    times = _working_times(processing_times)
+    
+    if initial_order is None:
+        initial_order = np.argsort(-times.sum(axis=0), kind='stable')
+    initial_order = [int(job) for job in initial_order]
+    
+    sequence = initial_order[:1]
+    for job in initial_order[1:]:
+        if should_stop is not None and should_stop():
+            raise SolveCancelled()
+        position, _ = _best_insertion(sequence, job, times)
+        sequence.insert(position, job)
+    
+    completion_time = calculate_makespan(sequence, processing_times)
+    return sequence, completion_time[-1][-1], completion_time
+
+def _insertion_local_search(sequence, makespan, times, rng, expired):
+    # Take every job out in turn and put it back at its best position,
+    # until a full pass brings no improvement.
+    improved = True
+    while improved and not expired():
+        improved = False
+        for job in rng.permutation(sequence).tolist():
+            if expired():
+                break
+            position = sequence.index(job)
+            sequence.pop(position)
+            best_position, new_makespan = _best_insertion(sequence, job, times)
+            if new_makespan < makespan:
+                position, makespan = best_position, new_makespan
+                improved = True
+            sequence.insert(position, job)
+    return sequence, makespan
+
+def iterated_greedy(processing_times, initial_order, time_budget_ms, seed=None, destruction=4, temperature=0.4,
+                    should_stop=None, on_improve=None, target=None):
+    # Ruiz and Stützle's iterated greedy: remove a few random jobs, put them
+    # back with NEH insertions, polish with insertion local search, and accept
+    # worse sequences with a simulated-annealing-like probability. Every move
+    # is scored with Taillard's acceleration, never a full makespan pass.
+    started = time.perf_counter()
+    deadline = started + time_budget_ms / 1000
+    
+    def expired():
+        return time.perf_counter() >= deadline or (should_stop is not None and should_stop())
+    
+    processing_times = np.asarray(processing_times)
+    times = _working_times(processing_times)
+    n_machines, n_jobs = times.shape
+    rng = np.random.default_rng(seed)
+    
+    current = [int(job) for job in initial_order]
+    current_makespan = calculate_makespans(current, processing_times)[0]
+    best, best_makespan = current[:], current_makespan
+    history = [{'elapsed_ms': 0.0, 'makespan': _to_python(best_makespan)}]
+    threshold = temperature * times.sum() / (n_jobs * n_machines * 10)
+    iterations = 0
+    
+    # Stop early once the incumbent reaches target (a lower bound).
+    while n_jobs > 1 and not expired() and (target is None or best_makespan > target):
+        candidate = current[:]
+        removed = [candidate.pop(rng.integers(len(candidate))) for _ in range(min(destruction, n_jobs - 1))]
+        for job in removed:
+            position, makespan = _best_insertion(candidate, job, times)
+            candidate.insert(position, job)
+        candidate, makespan = _insertion_local_search(candidate, makespan, times, rng, expired)
+        iterations += 1
         
-        all_orders.append({
-            'iteration': i + 1,
-            'order': [j + 1 for j in job_order],
-            'makespan': makespan
-        })
+        if makespan < current_makespan or (threshold > 0 and rng.random() <= math.exp(-(makespan - current_makespan) / threshold)):
+            current, current_makespan = candidate, makespan
+            if makespan < best_makespan:
+                best, best_makespan = candidate[:], makespan
+                history.append({
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+                    'makespan': _to_python(best_makespan)
+                })
+                if on_improve is not None:
+                    on_improve(best, best_makespan, iterations)
+    
+    completion_time = calculate_makespan(best, processing_times)
+    return best, completion_time[-1][-1], completion_time, iterations, history
+
+def branch_and_bound(processing_times, initial_order, node_limit=CDS_EXACT_NODE_LIMIT,
+                     time_limit_ms=CDS_EXACT_TIME_LIMIT_MS, should_stop=None):
+    # Depth-first branch and bound over job prefixes, starting from the
+    # initial_order schedule as upper bound. A child's bound is the
+    # machine-based bound of its partial schedule: for every machine, its
+    # completion time + the remaining load + the least remaining tail. All
+    # children of a node are bounded in one vectorized step.
+    deadline = time.perf_counter() + time_limit_ms / 1000
+    processing_times = np.asarray(processing_times)
+    times = _working_times(processing_times)
+    n_machines, n_jobs = times.shape
+    prefix = np.cumsum(times, axis=0)
+    before = prefix - times
+    tails = prefix[-1] - prefix
+    
+    best_order = [int(job) for job in initial_order]
+    best_makespan = calculate_makespans(best_order, times)[0]
+    root_bound = lower_bound(processing_times)
+    # A stack entry is (bound, completion, parent sequence, parent remaining
+    # jobs, child position); siblings share their parent's arrays and the
+    # child's own sequence and remaining jobs are built when it is popped.
+    stack = [(root_bound, np.zeros(n_machines, dtype=times.dtype), (), np.arange(n_jobs), None)]
+    nodes = 0
+    
+    while stack and best_makespan > root_bound:
+        if nodes >= node_limit or time.perf_counter() >= deadline or (should_stop is not None and should_stop()):
+            break
+        bound, completion, sequence, remaining, child = stack.pop()
+        if bound >= best_makespan:
+            continue
+        if child is not None:
+            sequence, remaining = sequence + (int(remaining[child]),), np.delete(remaining, child)
+        nodes += 1
+        
+        children = prefix[:, remaining] + np.maximum.accumulate(completion[:, np.newaxis] - before[:, remaining], axis=0)
+        if len(remaining) == 1:
+            if children[-1, 0] < best_makespan:
+                best_order, best_makespan = list(sequence) + [int(remaining[0])], children[-1, 0]
+            continue
+        
+        remaining_times = times[:, remaining]
+        rest_load = remaining_times.sum(axis=1)[:, np.newaxis] - remaining_times
+        child_tails = tails[:, remaining]
+        smallest = np.partition(child_tails, 1, axis=1)
+        least_other_tail = np.where(child_tails == smallest[:, :1], smallest[:, 1:2], smallest[:, :1])
+        bounds = (children + rest_load + least_other_tail).max(axis=0)
         
-        if makespan < best_makespan:
-            best_makespan = makespan
-            best_order = job_order
+        # Push the most promising child last so it is explored first.
+        promising = np.flatnonzero(bounds < best_makespan)
+        for child in promising[np.argsort(-bounds[promising], kind='stable')]:
+            stack.append((bounds[child], children[:, child].copy(), sequence, remaining, child))
     
-    return best_order, best_makespan, all_orders, calculate_makespan(best_order, processing_times)
+    # Whatever is left on the stack bounds the optimum from below.
+    optimal = not stack or best_makespan <= root_bound
+    proven_bound = best_makespan if optimal else max(root_bound, min(best_makespan, min(entry[0] for entry in stack)))
+    completion_time = calculate_makespan(best_order, processing_times)
+    return best_order, completion_time[-1][-1], completion_time, {
+        'optimal': bool(optimal),
+        'nodes': nodes,
+        'lower_bound': _to_python(proven_bound)
+    }
+
+PORTFOLIO_ENGINES = ('cds', 'palmer', 'gupta', 'neh')
+
+def portfolio(processing_times, deadline_ms, workers=None, bound=None, should_stop=None):
+    # Race the constructive heuristics and keep the best schedule available
+    # at the deadline. Palmer and Gupta are evaluated together in the calling
+    # thread, so a schedule always exists; CDS and NEH run on a pool and are
+    # both stopped at the deadline, so no late engine outlives the request
+    # by more than one evaluation batch.
+    started = time.perf_counter()
+    deadline = started + deadline_ms / 1000
+    stop = threading.Event()
+    stopped = lambda: stop.is_set() or (should_stop is not None and should_stop())
+    
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cds-portfolio')
+    futures = {
+        pool.submit(cds_algorithm, processing_times, workers, bound, None, stopped): 'cds',
+        pool.submit(neh_algorithm, processing_times, None, stopped): 'neh'
+    }
+    
+    candidates = {}
+    engines = {}
+    orders = [HEURISTICS[name](processing_times) for name in ('palmer', 'gupta')]
+    makespans = calculate_makespans(orders, processing_times)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for name, order, makespan in zip(('palmer', 'gupta'), orders, makespans):
+        candidates[name] = (order, makespan, [], None)
+        engines[name] = {'status': 'done', 'makespan': _to_python(makespan), 'elapsed_ms': elapsed_ms}
+    
+    pending = set(futures)
+    while pending and not stopped():
+        if bound is not None and min(candidate[1] for candidate in candidates.values()) <= bound:
+            break
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=min(remaining, 0.05), return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures[future]
+            try:
+                result = future.result()
+            except SolveCancelled:
+                continue
+            if name == 'cds':
+                order, makespan, all_orders, completion_time = result[:4]
+            else:
+                order, makespan, completion_time = result
+                all_orders = []
+            candidates[name] = (order, makespan, all_orders, completion_time)
+            engines[name] = {'status': 'done', 'makespan': _to_python(makespan), 'elapsed_ms': (time.perf_counter() - started) * 1000}
+    stop.set()
+    pool.shutdown(wait=False, cancel_futures=True)
+    
+    for name in futures.values():
+        engines.setdefault(name, {'status': 'timeout'})
+    
+    # Ties go to the first engine in PORTFOLIO_ENGINES order.
+    winner = min(candidates, key=lambda name: (candidates[name][1], PORTFOLIO_ENGINES.index(name)))
+    best_order, _, _, completion_time = candidates[winner]
+    # The CDS iterations are listed whenever CDS finished, even if it lost.
+    all_orders = candidates['cds'][2] if 'cds' in candidates else []
+    if completion_time is None:
+        completion_time = calculate_makespan(best_order, processing_times)
+    return best_order, completion_time[-1][-1], all_orders, completion_time, {
+        'winner': winner,
+        'deadline_ms': deadline_ms,
+        'engines': {name: engines[name] for name in PORTFOLIO_ENGINES}
+    }
+
+ALGORITHMS = ('cds', 'neh', 'cds+neh', 'exact', 'palmer', 'gupta', 'portfolio')
+
+def check_exact_size(processing_times):
+    if np.shape(processing_times)[1] > CDS_EXACT_MAX_JOBS:
+        raise ValueError(f"The exact mode is limited to {CDS_EXACT_MAX_JOBS} jobs")
+
+def solve(processing_times, algorithm='cds', workers=None, time_budget_ms=None, seed=None,
+          node_limit=None, time_limit_ms=None, deadline_ms=None, job_orders=None,
+          should_stop=None, on_progress=None, max_time_budget_ms=CDS_MAX_TIME_BUDGET_MS):
+    # should_stop is polled between stages and inside the improvers; a stop
+    # request before a full schedule exists raises SolveCancelled. on_progress
+    # receives (stage, best_order, best_makespan, iterations) as the
+    # incumbent improves.
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if algorithm == 'exact':
+        check_exact_size(processing_times)
+    
+    def report(stage, order, makespan, iterations=0):
+        if on_progress is not None:
+            on_progress(stage, order, makespan, iterations)
+    
+    with phase('lower_bound'):
+        bound = lower_bound(processing_times)
+    
+    race = dedup = None
+    if algorithm == 'neh':
+        with phase('neh'):
+            best_order, best_makespan, completion_time = neh_algorithm(processing_times, should_stop=should_stop)
+        all_orders = []
+        report('neh', best_order, best_makespan)
+    elif algorithm in HEURISTICS:
+        with phase(algorithm):
+            best_order = HEURISTICS[algorithm](processing_times)
+            completion_time = calculate_makespan(best_order, processing_times)
+        best_makespan = completion_time[-1][-1]
+        all_orders = []
+        report(algorithm, best_order, best_makespan)
+    elif algorithm == 'portfolio':
+        deadline_ms = min(CDS_PORTFOLIO_DEADLINE_MS if deadline_ms is None else deadline_ms, max_time_budget_ms)
+        with phase('portfolio'):
+            best_order, best_makespan, all_orders, completion_time, race = portfolio(
+                processing_times, deadline_ms, workers, bound, should_stop)
+        report('portfolio', best_order, best_makespan)
+    else:
+        best_order, best_makespan, all_orders, completion_time, dedup = cds_algorithm(processing_times, workers, bound, job_orders, should_stop)
+        report('cds', best_order, best_makespan)
+    
+    exact = None
+    if algorithm == 'exact':
+        exact = {'optimal': True, 'nodes': 0, 'lower_bound': bound}
+        if best_makespan > bound:
+            with phase('exact'):
+                best_order, best_makespan, completion_time, exact = branch_and_bound(
+                    processing_times, best_order,
+                    CDS_EXACT_NODE_LIMIT if node_limit is None else node_limit,
+                    min(CDS_EXACT_TIME_LIMIT_MS if time_limit_ms is None else time_limit_ms, max_time_budget_ms),
+                    should_stop)
+            bound = max(bound, exact['lower_bound'])
+        report('exact', best_order, best_makespan)
+    
+    if algorithm == 'cds+neh' and best_makespan > bound:
+        with phase('neh'):
+            neh_order, neh_makespan, neh_completion = neh_algorithm(processing_times, best_order, should_stop)
+        if neh_makespan <= best_makespan:
+            best_order, best_makespan, completion_time = neh_order, neh_makespan, neh_completion
+        report('neh', best_order, best_makespan)
+    
+    result = {
+        'best_order': best_order,
+        'best_makespan': best_makespan,
+        'all_orders': all_orders,
+        'completion_time': completion_time
+    }
+    
+    if time_budget_ms and best_makespan > bound:
+        time_budget_ms = min(time_budget_ms, max_time_budget_ms)
+        with phase('improve'):
+            best_order, best_makespan, completion_time, iterations, history = iterated_greedy(
+                processing_times, best_order, time_budget_ms, seed, should_stop=should_stop,
+                on_improve=lambda order, makespan, iterations: report('improve', order, makespan, iterations),
+                target=bound)
+        result.update({
+            'best_order': best_order,
+            'best_makespan': best_makespan,
+            'completion_time': completion_time,
+            'improvement': {
+                'time_budget_ms': time_budget_ms,
+                'iterations': iterations,
+                'history': history
+            }
+        })
+    
+    if exact is not None:
+        result['exact'] = exact
+    if race is not None:
+        result['portfolio'] = race
+    if dedup is not None:
+        result['dedup'] = dedup
+    result['best_makespan'] = _to_python(result['best_makespan'])
+    result['lower_bound'] = bound
+    result['gap'] = optimality_gap(result['best_makespan'], bound)
+    return result
+
+def optimality_gap(makespan, bound):
+    return float((makespan - bound) / bound) if bound > 0 else 0.0
+
+class ResultCache:
+    # In-process LRU bounded by entry count and total bytes, with entries
+    # expiring after ttl seconds. sizeof measures a value in bytes.
+    def __init__(self, maxsize, max_bytes, ttl, sizeof=len):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if self.maxsize <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic(), value, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._discard(key)
+            return entry[1]
+    
+    def _discard(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'maxsize': self.maxsize,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl
+            }
+
+def _record_size(record):
+    return sum(value.nbytes for value in record.values() if isinstance(value, np.ndarray))
+
+result_cache = ResultCache(CDS_CACHE_SIZE, CDS_CACHE_MAX_BYTES, CDS_CACHE_TTL)
+result_store = ResultCache(CDS_RESULT_STORE_SIZE, CDS_RESULT_STORE_MAX_BYTES, CDS_RESULT_STORE_TTL, _record_size)
+
+def store_result(result_id, result, processing_times):
+    # Keep what the PDF report needs as arrays rather than JSON lists.
+    all_orders = result['all_orders']
+    result_store.put(result_id, {
+        'best_order': np.asarray(result['best_order']) + 1,
+        'best_makespan': result['best_makespan'],
+        'iterations': np.array([order['iteration'] for order in all_orders], dtype=np.int64),
+        'orders': np.array([order['order'] for order in all_orders], dtype=np.int64).reshape(len(all_orders), len(result['best_order'])),
+        'makespans': np.array([order['makespan'] or 0 for order in all_orders]),
+        'pruned': np.array([order['makespan'] is None for order in all_orders], dtype=bool),
+        'processing_times': processing_times
+    })
+
+def _report_data(record):
+    return {
+        'best_order': record['best_order'],
+        'best_makespan': record['best_makespan'],
+        'all_orders': [
+            {'iteration': iteration, 'order': order, 'makespan': None if pruned else makespan}
+            for iteration, order, makespan, pruned in zip(record['iterations'].tolist(), record['orders'], record['makespans'].tolist(), record['pruned'].tolist())
+        ],
+        'processing_times': record['processing_times']
+    }
+
+def cache_key(processing_times, options):
+    processing_times = np.ascontiguousarray(processing_times)
+    digest = hashlib.sha256()
+    digest.update(f"{processing_times.dtype.str}{processing_times.shape}".encode())
+    digest.update(processing_times.view(np.uint8))
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+# Report layout: tables wider or longer than this are split into chunks
+# that reportlab can flow across pages. The processing times shown are
+# capped like the iteration rows, so the report size does not grow with
+# the instance.
+PDF_MAX_ITERATION_ROWS = 50
+PDF_MAX_ORDER_JOBS = 30
+PDF_JOBS_PER_TABLE = 10
+PDF_ROWS_PER_TABLE = 40
+PDF_MAX_MATRIX_JOBS = 100
+PDF_MAX_MATRIX_MACHINES = 40
+
+def _table_style(font_size, padding):
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 2 * padding),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('TOPPADDING', (0, 1), (-1, -1), padding),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), padding),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+@functools.lru_cache(maxsize=None)
+def _table_styles():
+    # Built on the first report, together with the reportlab import.
+    return _table_style(10, 6), _table_style(8, 2)
+
+def _format_order(order):
+    order = list(order)
+    text = ', '.join(map(str, order[:PDF_MAX_ORDER_JOBS]))
+    if len(order) > PDF_MAX_ORDER_JOBS:
+        text += f', … (+{len(order) - PDF_MAX_ORDER_JOBS})'
+    return text
 
 def create_pdf(data):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    # reportlab is only imported here, so cold starts that never build a
+    # report do not pay for it.
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    
+    iterations_table_style, processing_table_style = _table_styles()
+    
+    # The document is written to an anonymous temporary file rather than an
+    # in-memory buffer; the caller streams it back and closes it.
+    output = tempfile.TemporaryFile()
+    doc = SimpleDocTemplate(output, pagesize=letter)
     elements = []
     styles = getSampleStyleSheet()
 
@@ -112,85 +1218,87 @@ def create_pdf(data):
     elements.append(Paragraph(f"Makespan: {data['best_makespan']}", styles['Normal']))
     elements.append(Spacer(1, 12))
 
-    # All iterations table
+    # All iterations table, capped at PDF_MAX_ITERATION_ROWS rows
     elements.append(Paragraph("Toutes les itérations:", styles['Heading2']))
+    all_orders = data['all_orders']
     iterations_data = [['Itération', 'Ordre des tâches', 'Makespan']]
-    for order in data['all_orders']:
-        iterations_data.append([order['iteration'], ', '.join(map(str, order['order'])), order['makespan']])
+    for order in all_orders[:PDF_MAX_ITERATION_ROWS]:
+        iterations_data.append([order['iteration'], _format_order(order['order']), '–' if order['makespan'] is None else order['makespan']])
     
-    iterations_table = Table(iterations_data)
-    iterations_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    iterations_table = Table(iterations_data, repeatRows=1)
+    iterations_table.setStyle(iterations_table_style)
     elements.append(iterations_table)
+    if len(all_orders) > PDF_MAX_ITERATION_ROWS:
+        elements.append(Paragraph(f"{len(all_orders) - PDF_MAX_ITERATION_ROWS} itérations supplémentaires non affichées.", styles['Italic']))
     elements.append(Spacer(1, 12))
 
-    # Processing times table
+    # Processing times of the first PDF_MAX_MATRIX_MACHINES machines and
+    # PDF_MAX_MATRIX_JOBS jobs, in blocks of PDF_JOBS_PER_TABLE jobs by
+    # PDF_ROWS_PER_TABLE machines with fixed column widths
     elements.append(Paragraph("Temps de traitement:", styles['Heading2']))
-    processing_data = [[''] + [f'Tâche {j+1}' for j in range(len(data['processing_times'][0]))]]
-    for i, row in enumerate(data['processing_times']):
-        processing_data.append([f'Machine {i+1}'] + row)
+    processing_times = np.asarray(data['processing_times'])
+    omitted_machines = max(0, processing_times.shape[0] - PDF_MAX_MATRIX_MACHINES)
+    omitted_jobs = max(0, processing_times.shape[1] - PDF_MAX_MATRIX_JOBS)
+    processing_times = processing_times[:PDF_MAX_MATRIX_MACHINES, :PDF_MAX_MATRIX_JOBS]
+    n_machines, n_jobs = processing_times.shape
+    col_widths = [60] + [(doc.width - 60) / PDF_JOBS_PER_TABLE] * PDF_JOBS_PER_TABLE
     
-    processing_table = Table(processing_data)
-    processing_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(processing_table)
+    for first_job in range(0, n_jobs, PDF_JOBS_PER_TABLE):
+        jobs = range(first_job, min(first_job + PDF_JOBS_PER_TABLE, n_jobs))
+        header = [''] + [f'Tâche {j+1}' for j in jobs]
+        for first_machine in range(0, n_machines, PDF_ROWS_PER_TABLE):
+            block = processing_times[first_machine:first_machine + PDF_ROWS_PER_TABLE, jobs.start:jobs.stop].tolist()
+            processing_data = [header] + [[f'Machine {first_machine + i + 1}'] + row for i, row in enumerate(block)]
+            processing_table = Table(processing_data, colWidths=col_widths[:len(header)], rowHeights=12)
+            processing_table.setStyle(processing_table_style)
+            elements.append(processing_table)
+            elements.append(Spacer(1, 6))
+    if omitted_machines or omitted_jobs:
+        elements.append(Paragraph(f"{omitted_machines} machines et {omitted_jobs} tâches supplémentaires non affichées.", styles['Italic']))
 
     doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    output.seek(0)
+    return output
+
+def pdf_response(data):
+    with phase('pdf'):
+        pdf_buffer = create_pdf(data)
+    
+    response = send_file(
+        pdf_buffer,
+        as_attachment=True,
+        download_name='resultats_cds.pdf',
+        mimetype='application/pdf'
+    )
+    
+    # Add headers to prevent caching
+    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    response.headers["Pragma"] = "no-cache"
+    response.headers["Expires"] = "0"
+    
+    return response
+
+@app.route('/download-pdf/<result_id>', methods=['GET'])
+def download_stored_pdf(result_id):
+    record = result_store.get(result_id)
+    if record is None:
+        return jsonify({"error": "Unknown or expired result_id"}), 404
+    
+    try:
+        return pdf_response(_report_data(record))
+    except Exception as e:
+        logging.error(f"Error generating PDF: {str(e)}")
+        return jsonify({"error": str(e)}), 500
 
 @app.route('/download-pdf', methods=['POST'])
 def download_pdf():
     try:
         data = request.json
-        logging.debug(f"Received data for PDF: {data}")
         
         if not data:
             return jsonify({"error": "No data received"}), 400
         
-        pdf_buffer = create_pdf(data)
-        
-        response = send_file(
-            pdf_buffer,
-            as_attachment=True,
-            download_name='resultats_cds.pdf',
-            mimetype='application/pdf'
-        )
-        
-        # Add headers to prevent caching
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        
-        return response
+        return pdf_response(data)
     except Exception as e:
         logging.error(f"Error generating PDF: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -198,22 +1306,636 @@ def download_pdf():
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
-        data = request.json
-        processing_times = np.array(data['matrix'])
-        best_order, best_makespan, all_orders, completion_time = cds_algorithm(processing_times)
+        try:
+            with phase('parse'):
+                processing_times, data = read_instance()
+            options = solve_options(data, processing_times=processing_times)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        metrics.observe_instance(*processing_times.shape)
+        try:
+            gantt = gantt_options(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        workers = cds_workers(processing_times, data.get('workers'))
+        
+        key = None
+        if processing_times.dtype.kind in 'iufb':
+            key = cache_key(processing_times, dict(
+                options,
+                workers=workers,
+                echo_matrix='matrix' in data,
+                **gantt
+            ))
+            with phase('cache'):
+                cached = result_cache.get(key)
+            # The cached response points at a stored result; only serve it
+            # while that result can still be downloaded.
+            if cached is not None and result_store.get(key) is not None:
+                response = app.response_class(cached, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
         
-        gantt_data = prepare_gantt_data(completion_time, best_order, processing_times)
+        result = solve(processing_times, workers=workers, **options)
+        result_id = key or uuid.uuid4().hex
+        payload = build_payload(result_id, result, processing_times, data, options['algorithm'], workers, gantt)
         
+        with phase('serialize'):
+            response = jsonify(payload)
+        if key is not None:
+            result_cache.put(key, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+        return response
+    return render_template_string(HTML_TEMPLATE)
+
+def build_payload(result_id, result, processing_times, data, algorithm, workers, gantt):
+    store_result(result_id, result, processing_times)
+    
+    with phase('gantt'):
+        gantt_data = prepare_gantt_data(result['completion_time'], result['best_order'], processing_times, **gantt)
+    
+    payload = {
+        'result_id': result_id,
+        'best_order': [j + 1 for j in result['best_order']],
+        'best_makespan': result['best_makespan'],
+        'all_orders': result['all_orders'],
+        'gantt_data': gantt_data,
+        'lower_bound': result['lower_bound'],
+        'gap': result['gap'],
+        'algorithm': algorithm,
+        'workers': workers
+    }
+    for key in ('improvement', 'exact', 'portfolio', 'dedup'):
+        if key in result:
+            payload[key] = result[key]
+    if 'matrix' in data:
+        # File and binary uploads are not echoed back as JSON lists.
+        payload['processing_times'] = processing_times.tolist()
+    return payload
+
+def solve_options(data, defaults=None, processing_times=None):
+    # Keyword arguments for solve() taken from a request, falling back to
+    # defaults (the shared options of a batch). With processing_times, the
+    # size limits of the chosen algorithm are checked too.
+    defaults = defaults or {}
+    options = {key: data.get(key, defaults.get(key)) for key in ('algorithm', 'time_budget_ms', 'seed', 'node_limit', 'time_limit_ms', 'deadline_ms')}
+    options['algorithm'] = options['algorithm'] or 'cds'
+    if options['algorithm'] not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {options['algorithm']}")
+    if processing_times is not None and options['algorithm'] == 'exact':
+        check_exact_size(processing_times)
+    for key in ('time_budget_ms', 'node_limit', 'time_limit_ms', 'deadline_ms'):
+        value = options[key]
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+            raise ValueError(f"{key} must be a non-negative number")
+    seed = options['seed']
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        raise ValueError("seed must be a non-negative integer")
+    # workers is passed to solve() separately, but checked here with the rest.
+    workers = data.get('workers', defaults.get('workers'))
+    if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or workers < 1):
+        raise ValueError("workers must be a positive integer")
+    return options
+
+def _batch_instances(body):
+    # Instances come either from a JSON body {"instances": [...]} or from an
+    # NDJSON body read line by line, so solving starts before the upload ends.
+    # NDJSON lines are parsed with their instance, so a malformed line only
+    # fails its own line of the response.
+    if request.mimetype == 'application/x-ndjson':
+        instances = (line for line in request.stream if line.strip())
+    else:
+        instances = body['instances']
+    return enumerate(instances)
+
+def _solve_batch_instance(index, instance, defaults):
+    try:
+        if isinstance(instance, bytes):
+            instance = json.loads(instance)
+        if not isinstance(instance, dict):
+            instance = {'matrix': instance}
+        processing_times = matrix_from_json(instance['matrix'])
+        metrics.observe_instance(*processing_times.shape)
+        options = solve_options(instance, defaults, processing_times)
+        gantt = gantt_options(dict(defaults, **instance))
+        result = solve(processing_times, workers=1, **options)
+    except Exception as e:
+        return {'index': index, 'error': str(e)}
+    
+    line = {
+        'index': index,
+        'best_order': [j + 1 for j in result['best_order']],
+        'best_makespan': result['best_makespan'],
+        'all_orders': result['all_orders'],
+        'lower_bound': result['lower_bound'],
+        'gap': result['gap'],
+        'algorithm': options['algorithm']
+    }
+    if instance.get('gantt', defaults.get('gantt')):
+        line['gantt_data'] = prepare_gantt_data(result['completion_time'], result['best_order'], processing_times, **gantt)
+    for key in ('improvement', 'exact', 'portfolio', 'dedup'):
+        if key in result:
+            line[key] = result[key]
+    return line
+
+@app.route('/batch', methods=['POST'])
+def batch():
+    # Shared options come from the query string for NDJSON bodies and from
+    # the top-level object for JSON bodies; each instance may override them.
+    body = None
+    if request.mimetype == 'application/x-ndjson':
+        defaults = _typed_options(request.args)
+    else:
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict) or not isinstance(body.setdefault('instances', []), list):
+            return jsonify({"error": "'instances' must be a list"}), 400
+        defaults = {key: value for key, value in body.items() if key != 'instances'}
+    try:
+        solve_options(defaults)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    workers = max(1, min(defaults.get('workers') or 1, CDS_BATCH_MAX_WORKERS))
+    
+    def generate():
+        instances = _batch_instances(body)
+        if workers == 1:
+            for index, instance in instances:
+                yield json.dumps(_solve_batch_instance(index, instance, defaults)) + '\n'
+            return
+        
+        # Keep a bounded number of instances in flight and emit each line as
+        # soon as its instance is solved, in completion order.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for index, instance in instances:
+                pending.add(pool.submit(_solve_batch_instance, index, instance, defaults))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield json.dumps(future.result()) + '\n'
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield json.dumps(future.result()) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+class Job:
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.future = None
+        self.cancel_event = threading.Event()
+    
+    def to_dict(self):
+        job = {
+            'job_id': self.id,
+            'status': self.status,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+        if self.progress is not None:
+            job['progress'] = self.progress
+        if self.result is not None:
+            job['result'] = self.result
+        if self.error is not None:
+            job['error'] = self.error
+        return job
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_job_pool = None
+
+def _job_executor():
+    # Created on the first submission so cold starts do not spawn threads.
+    global _job_pool
+    with _jobs_lock:
+        if _job_pool is None:
+            _job_pool = ThreadPoolExecutor(max_workers=CDS_JOB_WORKERS, thread_name_prefix='cds-job')
+        return _job_pool
+
+def _active_jobs():
+    return sum(job.status in ('queued', 'running') for job in _jobs.values())
+
+def _forget_finished_jobs():
+    finished = [job_id for job_id, job in _jobs.items() if job.status not in ('queued', 'running')]
+    for job_id in finished[:max(0, len(finished) - CDS_JOB_RETENTION)]:
+        del _jobs[job_id]
+
+def _run_job(job, processing_times, data, options, gantt):
+    if job.cancel_event.is_set():
+        return
+    job.status = 'running'
+    job.started = time.time()
+    
+    def on_progress(stage, order, makespan, iterations):
+        job.progress = {
+            'stage': stage,
+            'best_order': [j + 1 for j in order],
+            'best_makespan': _to_python(makespan),
+            'iterations': iterations
+        }
+    
+    try:
+        result = solve(processing_times, workers=1, should_stop=job.cancel_event.is_set, on_progress=on_progress,
+                       max_time_budget_ms=CDS_JOB_MAX_TIME_BUDGET_MS, **options)
+        # A job cancelled during improvement still keeps its best schedule.
+        job.result = build_payload(job.id, result, processing_times, data, options['algorithm'], 1, gantt)
+        job.status = 'cancelled' if job.cancel_event.is_set() else 'done'
+    except SolveCancelled:
+        job.status = 'cancelled'
+    except Exception as e:
+        logging.error(f"Job {job.id} failed: {str(e)}")
+        job.error = str(e)
+        job.status = 'failed'
+    finally:
+        job.finished = time.time()
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    try:
+        with phase('parse'):
+            processing_times, data = read_instance()
+        options = solve_options(data, processing_times=processing_times)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        gantt = gantt_options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    metrics.observe_instance(*processing_times.shape)
+    
+    executor = _job_executor()
+    with _jobs_lock:
+        if _active_jobs() >= CDS_JOB_QUEUE:
+            return jsonify({"error": "Job queue is full"}), 503
+        job = Job(uuid.uuid4().hex)
+        _jobs[job.id] = job
+        _forget_finished_jobs()
+        job.future = executor.submit(_run_job, job, processing_times, data, options, gantt)
+    
+    return jsonify(job.to_dict()), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    with _jobs_lock:
         return jsonify({
-            'best_order': [j + 1 for j in best_order],
-            'best_makespan': best_makespan,
-            'all_orders': all_orders,
-            'gantt_data': gantt_data,
-            'processing_times': processing_times.tolist()
+            'workers': CDS_JOB_WORKERS,
+            'queue_limit': CDS_JOB_QUEUE,
+            'active': _active_jobs(),
+            'jobs': [{'job_id': job.id, 'status': job.status} for job in _jobs.values()]
         })
-    return render_template_string(HTML_TEMPLATE)
 
-def prepare_gantt_data(completion_time, job_order, processing_times):
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = _jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job_id"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = _jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job_id"}), 404
+    
+    job.cancel_event.set()
+    with _jobs_lock:
+        if job.future is not None and job.future.cancel():
+            job.status = 'cancelled'
+            job.finished = time.time()
+    return jsonify(job.to_dict())
+
+def _johnson_keys(times, job_id):
+    # Sort keys of one job in every k subproblem, as johnson_rule_batch
+    # orders them: (group, key, tie). job_id stands in for the job index in
+    # the tie, which keeps the order since ids grow with the index.
+    first = np.cumsum(times[:-1]).tolist()
+    last = _last_machines_times(times, np.empty(len(times) - 1, dtype=_working_dtype(times))).tolist()
+    return [
+        (0, -machine_1_time, -job_id, job_id) if machine_1_time < machine_2_time else (1, machine_2_time, job_id, job_id)
+        for machine_1_time, machine_2_time in zip(first, last)
+    ]
+
+class Session:
+    # An instance that changes a little at a time. For every k, the sorted
+    # Johnson keys of the jobs (which carry the subproblem prefix sums) are
+    # kept, with the matching orders of job ids, so a delta only moves the
+    # keys of the jobs it touches.
+    def __init__(self, session_id, processing_times, data, gantt):
+        self.id = session_id
+        self.lock = threading.Lock()
+        self.version = 0
+        self.data = data
+        self.gantt = gantt
+        self.processing_times = np.array(processing_times)
+        self.ids = list(range(self.processing_times.shape[1]))
+        self.next_id = len(self.ids)
+        self.payload = None
+        
+        self.orders = johnson_rule_batch(generate_subproblems(self.processing_times)).astype(np.int64)
+        keys = [_johnson_keys(self.processing_times[:, job], job) for job in self.ids]
+        self.keys = [[keys[job][k] for job in order] for k, order in enumerate(self.orders.tolist())]
+    
+    def nbytes(self):
+        return self.processing_times.nbytes + self.orders.nbytes + 100 * self.orders.size
+    
+    def job_orders(self):
+        # Job ids to current job indices.
+        index = np.empty(self.next_id, dtype=np.intp)
+        index[self.ids] = np.arange(len(self.ids))
+        return index[self.orders]
+    
+    def _insert(self, job_id, times):
+        positions = []
+        for keys, key in zip(self.keys, _johnson_keys(times, job_id)):
+            position = bisect_left(keys, key)
+            keys.insert(position, key)
+            positions.append(position)
+        
+        # Shift every row right of its insertion position in one step.
+        positions = np.array(positions, dtype=np.intp)[:, np.newaxis]
+        columns = np.arange(self.orders.shape[1] + 1)
+        source = np.clip(columns - (columns > positions), 0, max(0, self.orders.shape[1] - 1))
+        orders = np.take_along_axis(self.orders, source, axis=1) if self.orders.shape[1] else np.empty((len(positions), 1), dtype=np.int64)
+        np.put_along_axis(orders, positions, job_id, axis=1)
+        self.orders = orders
+    
+    def _remove(self, job_id, times):
+        positions = []
+        for keys, key in zip(self.keys, _johnson_keys(times, job_id)):
+            position = bisect_left(keys, key)
+            del keys[position]
+            positions.append(position)
+        
+        keep = np.arange(self.orders.shape[1]) != np.array(positions, dtype=np.intp)[:, np.newaxis]
+        self.orders = self.orders[keep].reshape(len(positions), self.orders.shape[1] - 1)
+    
+    def add_job(self, times):
+        job_id = self.next_id
+        self.next_id += 1
+        self.processing_times = np.column_stack([self.processing_times, np.asarray(times, dtype=self.processing_times.dtype)])
+        self.ids.append(job_id)
+        self._insert(job_id, self.processing_times[:, -1])
+    
+    def remove_job(self, job):
+        self._remove(self.ids[job], self.processing_times[:, job])
+        self.processing_times = np.delete(self.processing_times, job, axis=1)
+        del self.ids[job]
+    
+    def update(self, machine, job, value):
+        self._remove(self.ids[job], self.processing_times[:, job])
+        self.processing_times[machine, job] = value
+        self._insert(self.ids[job], self.processing_times[:, job])
+
+def _session_size(session):
+    return session.nbytes()
+
+sessions = ResultCache(CDS_SESSION_LIMIT, CDS_SESSION_MAX_BYTES, CDS_SESSION_TTL, _session_size)
+
+def _check_time(value, integer):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError("Processing times must be numbers")
+    if integer and value != int(value):
+        raise ValueError("This session has integer processing times")
+    return value
+
+def _check_deltas(deltas, n_machines, n_jobs, integer):
+    # Validate the whole list before applying any delta, following the job
+    # count as jobs are added and removed.
+    if not isinstance(deltas, list) or not deltas:
+        raise ValueError("deltas must be a non-empty list")
+    for delta in deltas:
+        op = delta.get('op') if isinstance(delta, dict) else None
+        if op == 'add_job':
+            times = delta.get('times')
+            if not isinstance(times, list) or len(times) != n_machines:
+                raise ValueError(f"add_job needs {n_machines} processing times")
+            for value in times:
+                _check_time(value, integer)
+            n_jobs += 1
+        elif op in ('remove_job', 'update'):
+            job = delta.get('job')
+            if isinstance(job, bool) or not isinstance(job, int) or not 1 <= job <= n_jobs:
+                raise ValueError(f"job must be between 1 and {n_jobs}")
+            if op == 'remove_job':
+                if n_jobs == 1:
+                    raise ValueError("A session needs at least one job")
+                n_jobs -= 1
+            else:
+                machine = delta.get('machine')
+                if isinstance(machine, bool) or not isinstance(machine, int) or not 1 <= machine <= n_machines:
+                    raise ValueError(f"machine must be between 1 and {n_machines}")
+                _check_time(delta.get('value'), integer)
+        else:
+            raise ValueError(f"Unknown delta op: {op}")
+
+def _session_payload(session):
+    processing_times = session.processing_times
+    result = solve(processing_times, workers=1, job_orders=session.job_orders())
+    payload = build_payload(f"{session.id}-{session.version}", result, processing_times, session.data, 'cds', 1, session.gantt)
+    payload.update({'session_id': session.id, 'version': session.version})
+    return payload
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    try:
+        with phase('parse'):
+            processing_times, data = read_instance()
+        # Sessions repair CDS's Johnson orders, so they take no other
+        # algorithm and no solver options.
+        options = solve_options(data)
+        if options.pop('algorithm') != 'cds' or any(value is not None for value in options.values()) or data.get('workers') is not None:
+            raise ValueError("Sessions only run CDS and take no solver options")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        gantt = gantt_options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    metrics.observe_instance(*processing_times.shape)
+    
+    session = Session(uuid.uuid4().hex, processing_times, data, gantt)
+    session.payload = _session_payload(session)
+    sessions.put(session.id, session)
+    return jsonify(session.payload), 201
+
+@app.route('/sessions/<session_id>', methods=['GET'])
+def get_session(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown session_id"}), 404
+    return jsonify(session.payload)
+
+@app.route('/sessions/<session_id>/deltas', methods=['POST'])
+def apply_deltas(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown session_id"}), 404
+    
+    data = request.get_json(silent=True) or {}
+    with session.lock:
+        n_machines, n_jobs = session.processing_times.shape
+        try:
+            _check_deltas(data.get('deltas'), n_machines, n_jobs, _exact_dtype(session.processing_times))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        with phase('deltas'):
+            for delta in data['deltas']:
+                if delta['op'] == 'add_job':
+                    session.add_job(delta['times'])
+                elif delta['op'] == 'remove_job':
+                    session.remove_job(delta['job'] - 1)
+                else:
+                    session.update(delta['machine'] - 1, delta['job'] - 1, delta['value'])
+        session.version += 1
+        session.payload = _session_payload(session)
+        # Re-put to refresh the session's size and expiry.
+        sessions.put(session.id, session)
+        return jsonify(session.payload)
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    if sessions.pop(session_id) is None:
+        return jsonify({"error": "Unknown session_id"}), 404
+    return jsonify({'session_id': session_id, 'deleted': True})
+
+@app.route('/gantt/<result_id>', methods=['GET'])
+def gantt_window(result_id):
+    # Zoom: the 'lod' Gantt data of a stored result for one time window.
+    record = result_store.get(result_id)
+    if record is None:
+        return jsonify({"error": "Unknown or expired result_id"}), 404
+    
+    try:
+        start = request.args.get('start', type=float)
+        end = request.args.get('end', type=float)
+        if start is not None and end is not None and start >= end:
+            raise ValueError("start must be before end")
+        gantt = gantt_options(_typed_options(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    job_order = record['best_order'] - 1
+    completion_time = calculate_makespan(job_order, record['processing_times'])
+    with phase('gantt'):
+        gantt_data = prepare_gantt_lod(completion_time, job_order, record['processing_times'],
+                                       gantt['gantt_max_bars'], gantt['gantt_width'], start, end)
+    return jsonify(gantt_data)
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+GANTT_FORMATS = ('columnar', 'records', 'lod')
+
+def gantt_options(data):
+    # Keyword arguments for prepare_gantt_data() taken from a request.
+    gantt_format = data.get('gantt_format', 'columnar')
+    if gantt_format not in GANTT_FORMATS:
+        raise ValueError(f"Unknown gantt_format: {gantt_format}")
+    options = {'gantt_format': gantt_format}
+    for key, default in (('gantt_max_bars', CDS_GANTT_MAX_BARS), ('gantt_width', None)):
+        value = data.get(key)
+        value = default if value is None else value
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+            raise ValueError(f"{key} must be a positive integer")
+        options[key] = value
+    return options
+
+def prepare_gantt_data(completion_time, job_order, processing_times, gantt_format='columnar',
+                       gantt_max_bars=CDS_GANTT_MAX_BARS, gantt_width=None):
+    if gantt_format == 'records':
+        return prepare_gantt_records(completion_time, job_order, processing_times)
+    if gantt_format == 'lod':
+        return prepare_gantt_lod(completion_time, job_order, processing_times, gantt_max_bars, gantt_width)
+    
+    # One entry per operation in parallel arrays, machine-major in sequence
+    # order; labels are sent once and referenced by index.
+    n_machines, n_jobs = completion_time.shape
+    job_order = np.asarray(job_order, dtype=np.intp)
+    durations = np.asarray(processing_times)[:, job_order].astype(completion_time.dtype)
+    
+    return {
+        'machines': [f'Machine {i+1}' for i in range(n_machines)],
+        'jobs': [f'Job {j+1}' for j in range(n_jobs)],
+        'machine': np.repeat(np.arange(n_machines), n_jobs).tolist(),
+        'job': np.tile(job_order, n_machines).tolist(),
+        'start': (completion_time - durations).ravel().tolist(),
+        'end': completion_time.ravel().tolist(),
+        'duration': durations.ravel().tolist()
+    }
+
+def prepare_gantt_lod(completion_time, job_order, processing_times, max_bars=CDS_GANTT_MAX_BARS, width=None,
+                      start=None, end=None):
+    # Level of detail for the [start, end] window (the whole schedule by
+    # default): every operation in it while there are at most max_bars,
+    # otherwise per-machine time buckets, width of them per machine at most,
+    # with the busy time and number of operations of each.
+    n_machines, n_jobs = completion_time.shape
+    job_order = np.asarray(job_order, dtype=np.intp)
+    durations = np.asarray(processing_times)[:, job_order].astype(completion_time.dtype)
+    starts = completion_time - durations
+    start = 0 if start is None else start
+    end = completion_time[-1, -1] if end is None else end
+    
+    visible = (completion_time > start) & (starts < end)
+    if visible.sum() <= max_bars:
+        # Labels only for the jobs in the window; job indexes them.
+        machines, positions = np.nonzero(visible)
+        jobs, job_index = np.unique(job_order[positions], return_inverse=True)
+        return {
+            'level': 'operations',
+            'window': [_to_python(start), _to_python(end)],
+            'machines': [f'Machine {i+1}' for i in range(n_machines)],
+            'jobs': [f'Job {j+1}' for j in jobs.tolist()],
+            'machine': machines.tolist(),
+            'job': job_index.tolist(),
+            'start': starts[visible].tolist(),
+            'end': completion_time[visible].tolist(),
+            'duration': durations[visible].tolist()
+        }
+    
+    n_buckets = max(1, max_bars // n_machines)
+    if width is not None:
+        n_buckets = min(n_buckets, width)
+    edges = np.linspace(start, end, n_buckets + 1)
+    
+    # Operations on a machine follow each other, so the time a machine has
+    # worked by t is the sum of the operations ended by t (searchsorted on
+    # the cumulated durations) plus the elapsed part of the current one.
+    worked = np.zeros((n_machines, n_buckets + 1))
+    operations = np.zeros((n_machines, n_buckets), dtype=np.int64)
+    for i in range(n_machines):
+        ended = np.searchsorted(completion_time[i], edges, side='right')
+        done = np.concatenate([[0], np.cumsum(durations[i])])[ended]
+        current = np.append(starts[i], np.inf)[ended]
+        worked[i] = done + np.clip(edges - current, 0, None)
+        operations[i] = np.searchsorted(starts[i], edges[1:], side='left') - ended[:-1]
+    busy = np.diff(worked, axis=1)
+    
+    machines, buckets = np.nonzero(busy > 0)
+    return {
+        'level': 'buckets',
+        'window': [_to_python(start), _to_python(end)],
+        'machines': [f'Machine {i+1}' for i in range(n_machines)],
+        'bucket_width': float(edges[1] - edges[0]),
+        'machine': machines.tolist(),
+        'start': edges[buckets].tolist(),
+        'end': edges[buckets + 1].tolist(),
+        'busy': busy[machines, buckets].tolist(),
+        'operations': operations[machines, buckets].tolist()
+    }
+
+def prepare_gantt_records(completion_time, job_order, processing_times):
     n_machines, n_jobs = completion_time.shape
     gantt_data = []
     
@@ -224,9 +1946,9 @@ def prepare_gantt_data(completion_time, job_order, processing_times):
             gantt_data.append({
                 'machine': f'Machine {i+1}',
                 'job': f'Job {job+1}',
-                'start': float(start),
-                'end': float(start + duration),
-                'duration': float(duration)
+                'start': _to_python(start),
+                'end': _to_python(start + duration),
+                'duration': _to_python(duration)
             })
     
     return gantt_data
@@ -263,6 +1985,18 @@ HTML_TEMPLATE = '''
                     <input type="number" id="jobs" min="2" value="4" class="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-indigo-500 focus:border-indigo-500">
                 </div>
             </div>
+            <div class="mb-4">
+                <label for="algorithm" class="block text-sm font-medium text-gray-700 mb-1">Algorithme :</label>
+                <select id="algorithm" class="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-indigo-500 focus:border-indigo-500">
+                    <option value="cds">CDS</option>
+                    <option value="neh">NEH</option>
+                    <option value="cds+neh">CDS + NEH</option>
+                    <option value="exact">Exact (séparation et évaluation)</option>
+                    <option value="palmer">Palmer</option>
+                    <option value="gupta">Gupta</option>
+                    <option value="portfolio">Portefeuille (CDS, Palmer, Gupta, NEH)</option>
+                </select>
+            </div>
             <button id="generate-matrix" class="w-full bg-indigo-600 text-white py-2 px-4 rounded-md hover:bg-indigo-700 transition duration-300 mb-4">
                 <i class="fas fa-table mr-2"></i>Générer la Matrice
             </button>
@@ -275,6 +2009,22 @@ HTML_TEMPLATE = '''
             <div id="gantt-chart-container" class="mt-6">
                 <canvas id="gantt-chart"></canvas>
             </div>
+            <div id="gantt-zoom" class="mt-2 flex flex-wrap items-end gap-2 hidden">
+                <div>
+                    <label for="zoom-start" class="block text-sm font-medium text-gray-700 mb-1">Début :</label>
+                    <input type="number" id="zoom-start" min="0" class="px-3 py-2 border border-gray-300 rounded-md">
+                </div>
+                <div>
+                    <label for="zoom-end" class="block text-sm font-medium text-gray-700 mb-1">Fin :</label>
+                    <input type="number" id="zoom-end" min="0" class="px-3 py-2 border border-gray-300 rounded-md">
+                </div>
+                <button id="zoom-apply" class="bg-indigo-600 text-white py-2 px-4 rounded-md hover:bg-indigo-700 transition duration-300">
+                    <i class="fas fa-search-plus mr-2"></i>Zoomer
+                </button>
+                <button id="zoom-reset" class="bg-gray-500 text-white py-2 px-4 rounded-md hover:bg-gray-600 transition duration-300">
+                    <i class="fas fa-undo mr-2"></i>Vue complète
+                </button>
+            </div>
             <div id="processing-times" class="mt-6"></div>
             <button id="download-pdf" class="mt-4 w-full bg-blue-600 text-white py-2 px-4 rounded-md hover:bg-blue-700 transition duration-300">
                 <i class="fas fa-file-pdf mr-2"></i>Télécharger les résultats en PDF
@@ -291,9 +2041,25 @@ HTML_TEMPLATE = '''
             const ganttChartContainer = document.getElementById('gantt-chart-container');
             const processingTimesContainer = document.getElementById('processing-times');
             let ganttChart = null;
+            let lastResultId = null;
 
             generateMatrixBtn.addEventListener('click', generateMatrix);
             calculateBtn.addEventListener('click', applyCDSAlgorithm);
+            document.getElementById('zoom-apply').addEventListener('click', () => loadGanttWindow(
+                document.getElementById('zoom-start').value, document.getElementById('zoom-end').value));
+            document.getElementById('zoom-reset').addEventListener('click', () => loadGanttWindow('', ''));
+
+            function loadGanttWindow(start, end) {
+                // Full detail for the window, or buckets while it is still too dense
+                const params = new URLSearchParams({ gantt_width: ganttChartContainer.clientWidth });
+                if (start !== '') params.set('start', start);
+                if (end !== '') params.set('end', end);
+                fetch(`/gantt/${lastResultId}?${params}`)
+                    .then(response => response.json())
+                    .then(ganttData => {
+                        if (!ganttData.error) createGanttChart(ganttData);
+                    });
+            }
 
             function generateMatrix() {
                 const machines = parseInt(document.getElementById('machines').value);
@@ -338,10 +2104,16 @@ HTML_TEMPLATE = '''
                     headers: {
                         'Content-Type': 'application/json',
                     },
-                    body: JSON.stringify({matrix: matrix}),
+                    body: JSON.stringify({
+                        matrix: matrix,
+                        algorithm: document.getElementById('algorithm').value,
+                        gantt_format: 'lod',
+                        gantt_width: ganttChartContainer.clientWidth
+                    }),
                 })
                 .then(response => response.json())
                 .then(data => {
+                    lastResultId = data.result_id;
                     displayResults(data);
                     displayExplanation(data);
                     createGanttChart(data.gantt_data);
@@ -354,6 +2126,7 @@ HTML_TEMPLATE = '''
                     <h3 class="text-xl font-semibold mb-2">Résultats :</h3>
                     <p class="font-semibold">Meilleur ordre des tâches : ${data.best_order.join(', ')}</p>
                     <p class="font-semibold">Makespan : ${data.best_makespan}</p>
+                    ${data.portfolio ? `<p class="font-semibold">Heuristique gagnante : ${data.portfolio.winner.toUpperCase()}</p>` : ''}
                     <h4 class="text-lg font-semibold mt-4 mb-2">Toutes les itérations :</h4>
                     <table class="w-full border-collapse">
                         <tr>
@@ -365,7 +2138,7 @@ HTML_TEMPLATE = '''
                             <tr class="${order.makespan === data.best_makespan ? 'bg-green-100' : ''}">
                                 <td class="border border-gray-300 p-2">${order.iteration}</td>
                                 <td class="border border-gray-300 p-2">${order.order.join(', ')}</td>
-                                <td class="border border-gray-300 p-2">${order.makespan}</td>
+                                <td class="border border-gray-300 p-2">${order.pruned ? '–' : order.makespan}</td>
                             </tr>
                         `).join('')}
                     </table>
@@ -398,23 +2171,45 @@ HTML_TEMPLATE = '''
                 }
 
                 const ctx = document.getElementById('gantt-chart').getContext('2d');
-                const machines = [...new Set(ganttData.map(d => d.machine))];
-                const jobs = [...new Set(ganttData.map(d => d.job))];
-                const colors = generateColors(jobs.length);
-
-                // Sort ganttData by start time
-                ganttData.sort((a, b) => a.start - b.start);
-
-                const datasets = jobs.map((job, jobIndex) => ({
-                    label: job,
-                    data: ganttData.filter(d => d.job === job).map(d => ({
-                        x: [d.start, d.end],
-                        y: d.machine,
-                        duration: d.duration
-                    })),
-                    backgroundColor: colors[jobIndex],
-                    barPercentage: 0.8
-                }));
+                const buckets = ganttData.level === 'buckets';
+                document.getElementById('gantt-zoom').classList.remove('hidden');
+                document.getElementById('zoom-start').value = ganttData.window[0];
+                document.getElementById('zoom-end').value = ganttData.window[1];
+
+                let datasets;
+                if (buckets) {
+                    // One bar per time bucket, shaded by machine occupancy
+                    datasets = [{
+                        label: 'Occupation',
+                        data: ganttData.machine.map((machine, k) => ({
+                            x: [ganttData.start[k], ganttData.end[k]],
+                            y: ganttData.machines[machine],
+                            busy: ganttData.busy[k],
+                            operations: ganttData.operations[k]
+                        })),
+                        backgroundColor: ganttData.busy.map(busy => `rgba(79, 70, 229, ${Math.max(0.15, busy / ganttData.bucket_width)})`),
+                        barPercentage: 0.8
+                    }];
+                } else {
+                    const colors = generateColors(ganttData.jobs.length);
+
+                    // Group the operation columns into one dataset per job
+                    const bars = ganttData.jobs.map(() => []);
+                    ganttData.job.forEach((job, k) => {
+                        bars[job].push({
+                            x: [ganttData.start[k], ganttData.end[k]],
+                            y: ganttData.machines[ganttData.machine[k]],
+                            duration: ganttData.duration[k]
+                        });
+                    });
+
+                    datasets = ganttData.jobs.map((job, jobIndex) => ({
+                        label: job,
+                        data: bars[jobIndex],
+                        backgroundColor: colors[jobIndex],
+                        barPercentage: 0.8
+                    }));
+                }
 
                 ganttChart = new Chart(ctx, {
                     type: 'bar',
@@ -425,7 +2220,9 @@ HTML_TEMPLATE = '''
                             x: {
                                 position: 'top',
                                 title: { display: true, text: 'Time' },
-                                stacked: true
+                                stacked: true,
+                                min: ganttData.window ? ganttData.window[0] : undefined,
+                                max: ganttData.window ? ganttData.window[1] : undefined
                             },
                             y: {
                                 title: { display: true, text: 'Machines' },
@@ -437,6 +2234,14 @@ HTML_TEMPLATE = '''
                                 callbacks: {
                                     label: (context) => {
                                         const data = context.raw;
+                                        if (buckets) {
+                                            return [
+                                                `Start: ${data.x[0]}`,
+                                                `End: ${data.x[1]}`,
+                                                `Busy: ${data.busy}`,
+                                                `Operations: ${data.operations}`
+                                            ];
+                                        }
                                         return [
                                             `${context.dataset.label}`,
                                             `Start: ${data.x[0]}`,
@@ -446,7 +2251,7 @@ HTML_TEMPLATE = '''
                                     }
                                 }
                             },
-                            legend: { position: 'bottom' },
+                            legend: { position: 'bottom', display: buckets || ganttData.jobs.length <= 50 },
                             title: {
                                 display: true,
                                 text: 'Gantt Chart - CDS Algorithm Schedule'
@@ -455,6 +2260,7 @@ HTML_TEMPLATE = '''
                         animation: {
                             onComplete: () => {
                                 const chartInstance = ganttChart;
+                                if (buckets) return;
                                 const ctx = chartInstance.ctx;
                                 ctx.textAlign = 'center';
                                 ctx.textBaseline = 'middle';
@@ -512,14 +2318,8 @@ HTML_TEMPLATE = '''
             downloadPdfBtn.addEventListener('click', downloadPdf);
 
             function downloadPdf() {
-                if (lastResults) {
-                    fetch('/download-pdf', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify(lastResults),
-                    })
+                if (lastResultId) {
+                    fetch(`/download-pdf/${lastResultId}`)
                     .then(response => response.blob())
                     .then(blob => {
                         const url = window.URL.createObjectURL(blob);
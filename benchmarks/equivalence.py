@@ -0,0 +1,177 @@
+# Exact-equivalence checks for the vectorized solvers.
+#
+# The fast paths promise results identical to simpler code, not just close
+# ones. Each check runs on random instances, small enough to hit ties and
+# duplicate orders often, and compares against a straightforward reference
+# kept here. The script prints one line per check and exits with status 1
+# on any mismatch.
+#
+#     python benchmarks/equivalence.py [--trials 200] [--seed 0]
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app
+
+def reference_johnson(two_machines_jobs):
+    # The original selection loop: repeatedly take the job with the smallest
+    # time, to the front if it is on machine 1, to the back otherwise.
+    jobs = list(range(len(two_machines_jobs)))
+    job_order = []
+    while jobs:
+        min_time = float('inf')
+        selected_job = selected_machine = None
+        for job in jobs:
+            machine_1_time, machine_2_time = two_machines_jobs[job]
+            if machine_1_time < min_time or machine_2_time < min_time:
+                min_time = min(machine_1_time, machine_2_time)
+                selected_job = job
+                selected_machine = 0 if machine_1_time < machine_2_time else 1
+        if selected_machine == 0:
+            job_order.insert(0, selected_job)
+        else:
+            job_order.append(selected_job)
+        jobs.remove(selected_job)
+    return job_order
+
+def reference_completion_times(jobs, processing_times):
+    # The original scalar recurrence over machines x jobs.
+    n_machines, n_jobs = len(processing_times), len(jobs)
+    completion_time = np.zeros((n_machines, n_jobs))
+    for i in range(n_machines):
+        for j in range(n_jobs):
+            previous = max(completion_time[i - 1][j] if i else 0, completion_time[i][j - 1] if j else 0)
+            completion_time[i][j] = previous + processing_times[i][jobs[j]]
+    return completion_time
+
+def random_times(rng, size, integer=True):
+    times = rng.integers(0, 6, size=size)
+    if integer:
+        return times
+    return times + rng.random(size).round(1)
+
+def random_instance(rng, integer=True):
+    return random_times(rng, (int(rng.integers(1, 8)), int(rng.integers(1, 10))), integer)
+
+def reference_subproblems(processing_times):
+    # The original per-job sums of the first k and the last m-k machines.
+    n_machines, n_jobs = processing_times.shape
+    return [
+        [(sum(processing_times[:k, job]), sum(processing_times[k:, job])) for job in range(n_jobs)]
+        for k in range(1, n_machines)
+    ]
+
+def check_johnson(rng, trials):
+    # Float sums must be rounded like the original ones, or ties flip.
+    failures = []
+    for trial in range(trials):
+        processing_times = random_instance(rng, integer=trial % 2 == 0)
+        if processing_times.shape[0] < 2:
+            continue
+        subproblems = app.generate_subproblems(processing_times)
+        batch = app.johnson_rule_batch(subproblems)
+        for k, subproblem in enumerate(reference_subproblems(processing_times)):
+            expected = reference_johnson(subproblem)
+            if subproblems[k].tolist() != [list(times) for times in subproblem]:
+                failures.append(f"generate_subproblems k={k + 1} on {processing_times.tolist()}")
+            if app.johnson_rule(subproblem) != expected or batch[k].tolist() != expected:
+                failures.append(f"johnson_rule on {subproblem}: {batch[k].tolist()} != {expected}")
+    return failures
+
+def check_makespan(rng, trials):
+    # Integer kernels must give exact integers, float kernels the bits of
+    # the scalar loop.
+    failures = []
+    for trial in range(trials):
+        processing_times = random_instance(rng, integer=trial % 2 == 0)
+        orders = np.array([rng.permutation(processing_times.shape[1]) for _ in range(4)])
+        makespans = app.calculate_makespans(orders, processing_times)
+        completions = app.calculate_completions(orders, processing_times)
+        for order, makespan, completion in zip(orders, makespans, completions):
+            expected = reference_completion_times(order, processing_times)
+            if not np.array_equal(app.calculate_makespan(order, processing_times), expected):
+                failures.append(f"calculate_makespan {order.tolist()} on {processing_times.tolist()}")
+            if not np.array_equal(completion, expected) or makespan != expected[-1][-1]:
+                failures.append(f"batched makespans {order.tolist()} on {processing_times.tolist()}")
+    return failures
+
+def random_deltas(rng, processing_times):
+    # A few random edits and the matrix they produce.
+    deltas = []
+    integer = processing_times.dtype.kind == 'i'
+    for _ in range(int(rng.integers(1, 4))):
+        op = str(rng.choice(['add_job', 'remove_job', 'update']))
+        if op == 'remove_job' and processing_times.shape[1] == 1:
+            op = 'add_job'
+        if op == 'add_job':
+            times = random_times(rng, processing_times.shape[0], integer)
+            deltas.append({'op': 'add_job', 'times': times.tolist()})
+            processing_times = np.column_stack([processing_times, times])
+        elif op == 'remove_job':
+            job = int(rng.integers(processing_times.shape[1]))
+            deltas.append({'op': 'remove_job', 'job': job + 1})
+            processing_times = np.delete(processing_times, job, axis=1)
+        else:
+            machine = int(rng.integers(processing_times.shape[0]))
+            job = int(rng.integers(processing_times.shape[1]))
+            value = random_times(rng, 1, integer)[0].item()
+            deltas.append({'op': 'update', 'machine': machine + 1, 'job': job + 1, 'value': value})
+            processing_times = processing_times.copy()
+            processing_times[machine, job] = value
+    return deltas, processing_times
+
+def check_sessions(rng, trials):
+    # A session repairs its Johnson orders after each edit; every version
+    # must match a full re-solve of the edited matrix.
+    client = app.app.test_client()
+    failures = []
+    for trial in range(trials):
+        processing_times = random_instance(rng, integer=trial % 4 != 0)
+        response = client.post('/sessions', json={'matrix': processing_times.tolist()})
+        session_id = response.get_json()['session_id']
+        for step in range(11):
+            if step:
+                deltas, processing_times = random_deltas(rng, processing_times)
+                response = client.post(f'/sessions/{session_id}/deltas', json={'deltas': deltas})
+            if response.status_code not in (200, 201):
+                failures.append(f"session request failed with {response.status_code} after {step} edits")
+                break
+            payload = response.get_json()
+            expected = app.solve(processing_times, workers=1)
+            expected['best_order'] = [j + 1 for j in expected['best_order']]
+            for key in ('best_order', 'best_makespan', 'all_orders', 'lower_bound', 'dedup'):
+                if payload.get(key) != expected[key]:
+                    failures.append(f"session {key} after {step} edits on {processing_times.tolist()}")
+        client.delete(f'/sessions/{session_id}')
+    return failures
+
+CHECKS = {
+    'johnson': check_johnson,
+    'makespan': check_makespan,
+    'sessions': check_sessions
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the vectorized solvers against reference implementations.')
+    parser.add_argument('--trials', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checks', nargs='+', choices=list(CHECKS), default=list(CHECKS))
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.checks:
+        failures = CHECKS[name](np.random.default_rng(args.seed), args.trials)
+        print(f"{name:>10}: {'ok' if not failures else f'{len(failures)} mismatches'}")
+        for failure in failures[:10]:
+            print(f"  {failure}", file=sys.stderr)
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
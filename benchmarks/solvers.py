@@ -0,0 +1,190 @@
+# Solver benchmark on Taillard-style flow-shop instances.
+#
+# Instances are generated offline with Taillard's linear congruential
+# generator (E. Taillard, "Benchmarks for basic scheduling problems", 1993),
+# so every run and every machine sees the same matrices. Each phase of the
+# CDS pipeline and each engine is timed, makespans are compared with the
+# Taillard lower bound and, where known, the best upper bound, and the
+# results are written to JSON. Passing --baseline compares against an
+# earlier results file and exits with status 1 on a regression.
+#
+#     python benchmarks/solvers.py --output bench.json
+#     python benchmarks/solvers.py --baseline bench.json --output new.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app
+
+# (name, jobs, machines, time seed, best known makespan or None). The ta*
+# seeds are the first instances of Taillard's classes; the 20x5 upper bounds
+# are proven optima. The lcg_* instances use the same generator with fixed
+# seeds for the sizes beyond Taillard's largest class (500x20).
+INSTANCES = [
+    ('ta001', 20, 5, 873654221, 1278),
+    ('ta002', 20, 5, 379008056, 1359),
+    ('ta003', 20, 5, 1866992158, 1081),
+    ('ta004', 20, 5, 216771124, 1293),
+    ('ta005', 20, 5, 495070989, 1235),
+    ('ta006', 20, 5, 402959317, 1195),
+    ('ta007', 20, 5, 1369363414, 1234),
+    ('ta008', 20, 5, 2021925980, 1206),
+    ('ta009', 20, 5, 573109518, 1230),
+    ('ta010', 20, 5, 88325120, 1108),
+    ('ta011', 20, 10, 587595453, None),
+    ('ta021', 20, 20, 479340445, None),
+    ('ta031', 50, 5, 1328042058, None),
+    ('ta041', 50, 10, 1958948863, None),
+    ('ta051', 50, 20, 1539989115, None),
+    ('ta061', 100, 5, 896678084, None),
+    ('ta071', 100, 10, 1179439976, None),
+    ('ta081', 100, 20, 1122278347, None),
+    ('ta091', 200, 10, 1471905122, None),
+    ('ta101', 200, 20, 471503978, None),
+    ('ta111', 500, 20, 2013025619, None),
+    ('lcg_2000x20', 2000, 20, 24680, None),
+    ('lcg_5000x50', 5000, 50, 13579, None),
+]
+
+SMALL_MAX_JOBS = 100
+
+ENGINES = ('cds', 'neh', 'cds+neh')
+
+def taillard_unif(seed, low, high):
+    # One step of Taillard's generator (Schrage's method for 16807 * seed
+    # mod 2^31 - 1), returning the new seed and an integer in [low, high].
+    m, a, b, c = 2147483647, 16807, 127773, 2836
+    k = seed // b
+    seed = a * (seed % b) - k * c
+    if seed < 0:
+        seed += m
+    return seed, low + int(seed / m * (high - low + 1))
+
+def generate_instance(seed, n_jobs, n_machines):
+    processing_times = np.empty((n_machines, n_jobs), dtype=np.int64)
+    for i in range(n_machines):
+        for j in range(n_jobs):
+            seed, processing_times[i, j] = taillard_unif(seed, 1, 99)
+    return processing_times
+
+def best_time_ms(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+def benchmark_instance(processing_times, upper_bound, engines, repeats, neh_max_jobs):
+    n_machines, n_jobs = processing_times.shape
+    lower_bound = app.lower_bound(processing_times)
+    phases = {}
+
+    phases['generate_subproblems'], subproblems = best_time_ms(lambda: app.generate_subproblems(processing_times), repeats)
+    phases['johnson_rule_batch'], job_orders = best_time_ms(lambda: app.johnson_rule_batch(subproblems), repeats)
+    phases['calculate_makespans'], makespans = best_time_ms(lambda: app.calculate_makespans(job_orders, processing_times), repeats)
+    best_order = job_orders[int(np.argmin(makespans))]
+    phases['calculate_makespan'], completion_time = best_time_ms(lambda: app.calculate_makespan(best_order, processing_times), repeats)
+    phases['prepare_gantt_data'], _ = best_time_ms(lambda: app.prepare_gantt_data(completion_time, best_order, processing_times), repeats)
+
+    results = {}
+    for engine in engines:
+        if 'neh' in engine and n_jobs > neh_max_jobs:
+            continue
+        elapsed, result = best_time_ms(lambda: app.solve(processing_times, engine), repeats)
+        makespan = float(result['best_makespan'])
+        results[engine] = {
+            'ms': elapsed,
+            'makespan': makespan,
+            'gap_to_lower_bound': (makespan - lower_bound) / lower_bound,
+            'gap_to_upper_bound': None if upper_bound is None else (makespan - upper_bound) / upper_bound
+        }
+
+    return {
+        'jobs': n_jobs,
+        'machines': n_machines,
+        'lower_bound': lower_bound,
+        'upper_bound': upper_bound,
+        'phases_ms': phases,
+        'engines': results
+    }
+
+def compare(results, baseline, time_tolerance, min_ms):
+    # A timing regresses when it is both above min_ms and more than
+    # time_tolerance slower than the baseline; a makespan regresses when it
+    # gets worse at all.
+    regressions = []
+    for name, current in results['instances'].items():
+        previous = baseline['instances'].get(name)
+        if previous is None:
+            continue
+        timings = [(f'phase {phase}', ms, previous['phases_ms'].get(phase)) for phase, ms in current['phases_ms'].items()]
+        for engine, result in current['engines'].items():
+            before = previous['engines'].get(engine)
+            if before is None:
+                continue
+            timings.append((f'engine {engine}', result['ms'], before['ms']))
+            if result['makespan'] > before['makespan']:
+                regressions.append(f"{name}: {engine} makespan {before['makespan']:g} -> {result['makespan']:g}")
+        for label, ms, before in timings:
+            if before is not None and ms > min_ms and ms > before * (1 + time_tolerance):
+                regressions.append(f"{name}: {label} {before:.2f} ms -> {ms:.2f} ms")
+    return regressions
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the flow-shop solvers on Taillard-style instances.')
+    parser.add_argument('--sizes', choices=('small', 'all'), default='all')
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--neh-max-jobs', type=int, default=500)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--min-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'instances': {}
+    }
+    for name, n_jobs, n_machines, seed, upper_bound in INSTANCES:
+        if args.sizes == 'small' and n_jobs > SMALL_MAX_JOBS:
+            continue
+        processing_times = generate_instance(seed, n_jobs, n_machines)
+        result = benchmark_instance(processing_times, upper_bound, args.engines, args.repeats, args.neh_max_jobs)
+        results['instances'][name] = result
+        summary = ', '.join(f"{engine} {r['makespan']:g} ({r['ms']:.1f} ms)" for engine, r in result['engines'].items())
+        print(f"{name:>12} {n_jobs}x{n_machines} LB {result['lower_bound']}: {summary}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_tolerance, args.min_ms)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# Cold-start benchmark for the serverless deployment.
+#
+# Each run starts a fresh interpreter, imports app and serves a first GET /
+# and a first POST /, the way a cold Vercel function does. The medians are
+# checked against the budgets below; the script exits with status 1 when a
+# budget is exceeded or when the solve path pulled in reportlab.
+#
+#     python benchmarks/startup.py [--runs 5] [--import-budget-ms 1500]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+client.get('/')
+first_get = time.perf_counter()
+client.post('/', json={'matrix': [[3, 5, 2, 7], [4, 1, 6, 2], [5, 3, 2, 4]]})
+first_post = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_get_ms': (first_get - imported) * 1000,
+    'first_post_ms': (first_post - first_get) * 1000,
+    'reportlab_loaded': any(name.split('.')[0] == 'reportlab' for name in sys.modules)
+}))
+'''
+
+def run_probe():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start import and first-request time.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=1500)
+    parser.add_argument('--first-request-budget-ms', type=float, default=500)
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.runs)]
+    summary = {key: statistics.median(run[key] for run in runs) for key in ('import_ms', 'first_get_ms', 'first_post_ms')}
+    summary['reportlab_loaded'] = any(run['reportlab_loaded'] for run in runs)
+    print(json.dumps(summary, indent=2))
+
+    failures = []
+    if summary['import_ms'] > args.import_budget_ms:
+        failures.append(f"import took {summary['import_ms']:.0f} ms (budget {args.import_budget_ms:.0f} ms)")
+    for key in ('first_get_ms', 'first_post_ms'):
+        if summary[key] > args.first_request_budget_ms:
+            failures.append(f"{key} is {summary[key]:.0f} ms (budget {args.first_request_budget_ms:.0f} ms)")
+    if summary['reportlab_loaded']:
+        failures.append("reportlab was imported outside the PDF path")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())